@@ -0,0 +1,159 @@
+import os
+import bcrypt
+from database import db
+from utils import make_unusable_password, issue_activation_token
+from Models.candidate import Candidate, AppliedCandidate, Education, Skills, IngestedResume
+from CandidateRoutes.utils import get_profile_updates, build_education_rows, build_skill_rows
+
+DEFAULT_PASSWORD = "12345678"
+
+def use_deferred_credentials():
+    """
+    BULK_DEFERRED_CREDENTIALS (default false): bulk-created candidates get an unusable
+    password and a one-time activation token instead of a bcrypt-hashed default password.
+    Only enable it once send_email delivers mail and the frontend serves /activate,
+    otherwise those candidates can never log in.
+    """
+    return os.getenv('BULK_DEFERRED_CREDENTIALS', 'false').lower() == 'true'
+
+def new_candidate_credentials():
+    """Credential columns for a bulk-created candidate, plus the activation token to deliver (or None)"""
+    if not use_deferred_credentials():
+        hashed_password = bcrypt.hashpw(DEFAULT_PASSWORD.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return {'password': hashed_password}, None
+
+    token, token_hash, expires_at = issue_activation_token()
+    return {
+        'password': make_unusable_password(),
+        'activation_token_hash': token_hash,
+        'activation_expires_at': expires_at
+    }, token
+
+def upsert_parsed_resumes(company_job_id, entries):
+    """
+    Create or update the candidates and applications for a batch of parsed resumes
+    using set-based queries: one IN lookup for the emails, bulk inserts for new
+    candidates, applications, education and skills. The caller commits.
+    Each file's content hash is added to the job's ingestion manifest in the same transaction.
+    entries: dicts with filename, email, relative_path, content_hash and parsed_data.
+    Returns one outcome dict per entry (filename, email, name, created, applied,
+    activation_token); the token is only set for candidates created in deferred-credential mode.
+    """
+    # A later resume with the same email wins, as if the files were processed one by one
+    by_email = {}
+    for entry in entries:
+        by_email[entry['email']] = entry
+    emails = list(by_email.keys())
+
+    existing = {row.email: row for row in db.session.query(
+        Candidate.candidate_id, Candidate.email, Candidate.fullname,
+        Candidate.experience, Candidate.profile_version
+    ).filter(Candidate.email.in_(emails)).all()}
+
+    profile_updates = {
+        email: get_profile_updates(entry['parsed_data'].get('candidate', {}))
+        for email, entry in by_email.items()
+    }
+
+    # New candidates get the profile data directly, so no follow-up update is needed
+    new_emails = [email for email in emails if email not in existing]
+    activation_tokens = {}
+    if new_emails:
+        new_rows = []
+        for email in new_emails:
+            credentials, activation_tokens[email] = new_candidate_credentials()
+            new_rows.append({
+                **profile_updates[email],
+                **credentials,
+                'email': email,
+                'fullname': profile_updates[email].get('fullname') or 'New Candidate',
+                'resume_file_path': by_email[email]['relative_path']
+            })
+        db.session.bulk_insert_mappings(Candidate, new_rows)
+
+    # Existing candidates are overwritten with the parsed data and their scores marked stale
+    if existing:
+        db.session.bulk_update_mappings(Candidate, [{
+            **profile_updates[email],
+            'candidate_id': row.candidate_id,
+            'profile_version': (row.profile_version or 1) + 1
+        } for email, row in existing.items()])
+
+    candidate_ids = {email: row.candidate_id for email, row in existing.items()}
+    if new_emails:
+        candidate_ids.update(
+            (row.email, row.candidate_id) for row in db.session.query(
+                Candidate.candidate_id, Candidate.email
+            ).filter(Candidate.email.in_(new_emails)).all()
+        )
+    ids = list(candidate_ids.values())
+
+    already_applied = {row.candidate_id for row in db.session.query(AppliedCandidate.candidate_id).filter(
+        AppliedCandidate.job_id == company_job_id,
+        AppliedCandidate.candidate_id.in_(ids)
+    ).all()}
+    new_applications = {candidate_id for candidate_id in ids if candidate_id not in already_applied}
+    if new_applications:
+        db.session.bulk_insert_mappings(AppliedCandidate, [
+            {'candidate_id': candidate_id, 'job_id': company_job_id} for candidate_id in new_applications
+        ])
+
+    # Replace education and skills for the whole batch
+    Education.query.filter(Education.candidate_id.in_(ids)).delete(synchronize_session=False)
+    Skills.query.filter(Skills.candidate_id.in_(ids)).delete(synchronize_session=False)
+
+    education_rows = []
+    skill_rows = []
+    for email, candidate_id in candidate_ids.items():
+        parsed_data = by_email[email]['parsed_data']
+        education_rows.extend(build_education_rows(candidate_id, parsed_data.get('education', [])))
+        skill_rows.extend(build_skill_rows(candidate_id, parsed_data.get('skills', [])))
+    if education_rows:
+        db.session.bulk_insert_mappings(Education, education_rows)
+    if skill_rows:
+        db.session.bulk_insert_mappings(Skills, skill_rows)
+
+    # Record the files in the manifest so re-uploads of the same content are skipped
+    hashes = {entry['content_hash']: candidate_ids[entry['email']] for entry in entries}
+    known_hashes = {row.content_hash for row in db.session.query(IngestedResume.content_hash).filter(
+        IngestedResume.job_id == company_job_id,
+        IngestedResume.content_hash.in_(list(hashes.keys()))
+    ).all()}
+    manifest_rows = [
+        {'job_id': company_job_id, 'content_hash': content_hash, 'candidate_id': candidate_id}
+        for content_hash, candidate_id in hashes.items() if content_hash not in known_hashes
+    ]
+    if manifest_rows:
+        db.session.bulk_insert_mappings(IngestedResume, manifest_rows)
+
+    # Embed all experiences in one batch so shortlisting only needs a lookup.
+    # The savepoint keeps a failed embedding write from aborting the batch's transaction.
+    db.session.flush()
+    try:
+        from ResumeShortlister.embeddingStore import store_experience_embeddings
+        with db.session.begin_nested():
+            store_experience_embeddings({
+                candidate_id: profile_updates[email].get('experience')
+                or (existing[email].experience if email in existing else None)
+                for email, candidate_id in candidate_ids.items()
+            })
+    except Exception as e:
+        # Shortlisting backfills missing embeddings, so this must not block the upload
+        print(f"Error storing experience embeddings: {str(e)}")
+
+    outcomes = []
+    for entry in entries:
+        email = entry['email']
+        winner = by_email[email] is entry
+        candidate_id = candidate_ids[email]
+        outcomes.append({
+            'filename': entry['filename'],
+            'email': email,
+            'name': profile_updates[email].get('fullname') or (
+                existing[email].fullname if email in existing else 'New Candidate'
+            ),
+            'created': winner and email not in existing,
+            'applied': winner and candidate_id in new_applications,
+            'activation_token': activation_tokens.get(email) if winner else None
+        })
+    return outcomes
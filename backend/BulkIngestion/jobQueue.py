@@ -0,0 +1,98 @@
+import os
+import time
+import threading
+from .jobStore import claim_next_job, finish_job, renew_lease, requeue_stale_jobs, get_lease_settings
+
+_wakeup = threading.Event()
+_workers = []
+_workers_lock = threading.Lock()
+_workers_pid = None
+
+def get_worker_count():
+    """Bulk upload jobs processed concurrently per web worker process (BULK_UPLOAD_WORKERS)"""
+    return max(1, int(os.getenv('BULK_UPLOAD_WORKERS', 2)))
+
+def ensure_workers_started(app):
+    """
+    Start the in-process worker threads once per process.
+    Threads do not survive a fork, so they are started lazily from a request
+    rather than at import time under gunicorn --preload.
+    """
+    global _workers_pid
+
+    if _workers_pid == os.getpid():
+        return
+
+    with _workers_lock:
+        if _workers_pid == os.getpid():
+            return
+
+        # Jobs left running by a process that died are queued again
+        recovered = requeue_stale_jobs()
+        if recovered:
+            print(f"Recovered {recovered} interrupted bulk upload job(s)")
+        
+        _workers.clear()
+        for idx in range(get_worker_count()):
+            worker = threading.Thread(target=_worker_loop, args=(app,), name=f'bulk-upload-{idx}', daemon=True)
+            worker.start()
+            _workers.append(worker)
+        _workers_pid = os.getpid()
+
+def notify_new_job():
+    """Wake an idle worker instead of waiting for the next poll"""
+    _wakeup.set()
+
+def _heartbeat(job, stop):
+    """
+    Renew the job's lease until stop is set, so only dead workers lose their jobs.
+    If the lease was lost anyway (the job was requeued), set job['lease_lost'] so
+    processing stops and leaves the job to its new owner.
+    """
+    interval = get_lease_settings()['lease_seconds'] / 3
+    while not stop.wait(interval):
+        try:
+            if not renew_lease(job['job_id'], job['lease_owner']):
+                print(f"Lost the lease on bulk upload job {job['job_id']}, stopping")
+                job['lease_lost'].set()
+                return
+        except Exception as e:
+            print(f"Error renewing lease on bulk upload job {job['job_id']}: {str(e)}")
+
+def _worker_loop(app):
+    from database import db
+    from .processBulkUpload import process_bulk_job
+
+    while True:
+        # Nothing may end this thread: ensure_workers_started never starts it again
+        try:
+            _run_next_job(app, db, process_bulk_job)
+        except Exception as e:
+            # e.g. the job store stayed locked past its busy timeout
+            print(f"Error in bulk upload worker, retrying: {str(e)}")
+            time.sleep(5)
+
+def _run_next_job(app, db, process_bulk_job):
+    job = claim_next_job()
+    if not job:
+        # Jobs queued by other processes, or whose worker died, are picked up on the next poll
+        requeue_stale_jobs()
+        _wakeup.wait(timeout=5)
+        _wakeup.clear()
+        return
+
+    job['lease_lost'] = threading.Event()
+    stop_heartbeat = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(job, stop_heartbeat), name='bulk-heartbeat', daemon=True)
+    heartbeat.start()
+    with app.app_context():
+        try:
+            process_bulk_job(job)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error processing bulk upload job {job['job_id']}: {str(e)}")
+            finish_job(job['job_id'], 'failed', f'Error processing bulk upload: {str(e)}', job['lease_owner'])
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+            db.session.remove()
@@ -0,0 +1,221 @@
+import os
+import uuid
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+_local = threading.local()
+
+def get_lease_settings():
+    """
+    BULK_JOB_LEASE_SECONDS: how long a claimed job stays owned without a heartbeat.
+    BULK_JOB_MAX_ATTEMPTS: claims of one job before a job whose worker keeps dying is failed.
+    """
+    return {
+        'lease_seconds': max(10, int(os.getenv('BULK_JOB_LEASE_SECONDS', 120))),
+        'max_attempts': max(1, int(os.getenv('BULK_JOB_MAX_ATTEMPTS', 3)))
+    }
+
+def get_job_db_path():
+    """SQLite file holding bulk upload jobs, shared by every worker process on the host"""
+    return os.getenv('BULK_JOB_DB_PATH') or os.path.join(os.getcwd(), 'Uploads', 'bulk_jobs.sqlite3')
+
+def _connect():
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        return conn
+
+    db_path = get_job_db_path()
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS bulk_jobs (
+            job_id TEXT PRIMARY KEY,
+            company_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            zip_path TEXT NOT NULL,
+            original_filename TEXT,
+            files_found INTEGER DEFAULT 0,
+            message TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS bulk_job_files (
+            job_id TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            status TEXT NOT NULL,
+            error TEXT,
+            email TEXT,
+            name TEXT,
+            created INTEGER DEFAULT 0,
+            applied INTEGER DEFAULT 0,
+            updated_at TEXT,
+            PRIMARY KEY (job_id, filename)
+        );
+        CREATE INDEX IF NOT EXISTS ix_bulk_jobs_status ON bulk_jobs (status, created_at);
+    ''')
+    # Lease columns, added to job stores created before they existed
+    columns = {row['name'] for row in conn.execute('PRAGMA table_info(bulk_jobs)')}
+    for column, ddl in [('lease_owner', 'TEXT'), ('lease_expires_at', 'TEXT'), ('attempts', 'INTEGER DEFAULT 0')]:
+        if column not in columns:
+            try:
+                conn.execute(f'ALTER TABLE bulk_jobs ADD COLUMN {column} {ddl}')
+            except sqlite3.OperationalError:
+                # Another process added it first
+                pass
+    _local.conn = conn
+    return conn
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+def _lease_expiry():
+    return (datetime.now() + timedelta(seconds=get_lease_settings()['lease_seconds'])).isoformat(timespec='seconds')
+
+def create_job(company_id, zip_path, original_filename):
+    """Queue a bulk upload job and return its ID"""
+    job_id = uuid.uuid4().hex
+    _connect().execute(
+        'INSERT INTO bulk_jobs (job_id, company_id, status, zip_path, original_filename, created_at, updated_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (job_id, company_id, 'queued', zip_path, original_filename, _now(), _now())
+    )
+    return job_id
+
+def claim_next_job():
+    """
+    Atomically move the oldest queued job to running under a new lease and return it
+    (with its lease_owner token), or None. The owner must renew the lease with
+    renew_lease until the job finishes.
+    """
+    conn = _connect()
+    lease_owner = f'{os.getpid()}-{uuid.uuid4().hex}'
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        row = conn.execute(
+            "SELECT * FROM bulk_jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE bulk_jobs SET status = 'running', lease_owner = ?, lease_expires_at = ?, "
+                "attempts = COALESCE(attempts, 0) + 1, updated_at = ? WHERE job_id = ?",
+                (lease_owner, _lease_expiry(), _now(), row['job_id'])
+            )
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    if not row:
+        return None
+    job = dict(row)
+    job['lease_owner'] = lease_owner
+    return job
+
+def renew_lease(job_id, lease_owner):
+    """Heartbeat for a running job; False once the lease was lost to recovery"""
+    cursor = _connect().execute(
+        "UPDATE bulk_jobs SET lease_expires_at = ? WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+        (_lease_expiry(), job_id, lease_owner)
+    )
+    return cursor.rowcount == 1
+
+def requeue_stale_jobs():
+    """
+    Put running jobs whose lease expired (their worker or process died) back in the queue,
+    or fail them once they have used up BULK_JOB_MAX_ATTEMPTS claims.
+    Re-running a job is safe: files it already ingested are skipped through the manifest.
+    Returns the number of jobs recovered.
+    """
+    conn = _connect()
+    now = _now()
+    # Jobs claimed before leases existed have no expiry; treat them as stale too
+    stale = "status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        failed = conn.execute(
+            f"UPDATE bulk_jobs SET status = 'failed', lease_owner = NULL, lease_expires_at = NULL, "
+            f"message = 'Bulk upload was interrupted too many times', updated_at = ? "
+            f"WHERE {stale} AND COALESCE(attempts, 0) >= ?",
+            (now, now, get_lease_settings()['max_attempts'])
+        ).rowcount
+        requeued = conn.execute(
+            f"UPDATE bulk_jobs SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL, updated_at = ? "
+            f"WHERE {stale}",
+            (now, now)
+        ).rowcount
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    return failed + requeued
+
+def set_files_found(job_id, files_found):
+    _connect().execute(
+        'UPDATE bulk_jobs SET files_found = ?, updated_at = ? WHERE job_id = ?',
+        (files_found, _now(), job_id)
+    )
+
+def record_file(job_id, filename, status, error=None, email=None, name=None, created=False, applied=False):
+    """Record the progress of one file; status is one of pending, processing, done, skipped, error"""
+    _connect().execute(
+        'INSERT INTO bulk_job_files (job_id, filename, status, error, email, name, created, applied, updated_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+        'ON CONFLICT (job_id, filename) DO UPDATE SET status = excluded.status, error = excluded.error, '
+        'email = excluded.email, name = excluded.name, created = excluded.created, '
+        'applied = excluded.applied, updated_at = excluded.updated_at',
+        (job_id, filename, status, error, email, name, int(created), int(applied), _now())
+    )
+
+def finish_job(job_id, status, message=None, lease_owner=None):
+    """
+    Record the job's final status. With lease_owner, only while that lease is still held,
+    so a worker whose job was requeued cannot overwrite the new owner's result.
+    Returns whether the job was updated.
+    """
+    query = ('UPDATE bulk_jobs SET status = ?, message = ?, lease_owner = NULL, lease_expires_at = NULL, '
+             'updated_at = ? WHERE job_id = ?')
+    params = [status, message, _now(), job_id]
+    if lease_owner is not None:
+        query += ' AND lease_owner = ?'
+        params.append(lease_owner)
+    return _connect().execute(query, params).rowcount == 1
+
+def get_job_status(job_id):
+    """
+    Job status with per-file progress, or None if the job does not exist.
+    Once finished, the summary keys match the old synchronous bulk upload response.
+    """
+    conn = _connect()
+    job = conn.execute('SELECT * FROM bulk_jobs WHERE job_id = ?', (job_id,)).fetchone()
+    if not job:
+        return None
+
+    files = [dict(row) for row in conn.execute(
+        'SELECT filename, status, error, email, name, created, applied FROM bulk_job_files '
+        'WHERE job_id = ? ORDER BY rowid', (job_id,)
+    )]
+
+    return {
+        'job_id': job['job_id'],
+        'company_id': job['company_id'],
+        'status': job['status'],
+        'message': job['message'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at'],
+        'files_found': job['files_found'],
+        'processed_files': sum(1 for f in files if f['status'] in ('done', 'skipped', 'error')),
+        'total_files': sum(1 for f in files if f['status'] == 'done'),
+        'candidates_created': [{'email': f['email'], 'name': f['name']} for f in files if f['created']],
+        'candidates_applied': [{'email': f['email'], 'name': f['name']} for f in files if f['applied']],
+        'errors': [{'filename': f['filename'], 'error': f['error']} for f in files if f['status'] == 'error'],
+        'skipped_files': [f['filename'] for f in files if f['status'] == 'skipped'],
+        'files': [{
+            'filename': f['filename'],
+            'status': f['status'],
+            'error': f['error'],
+            'email': f['email']
+        } for f in files]
+    }
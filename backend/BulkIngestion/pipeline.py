@@ -0,0 +1,155 @@
+import os
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ResumeParser.parseCache import get_cached_parse, store_parse
+from ResumeParser.extractionPool import get_extraction_settings
+from ResumeParser.llmGateway import get_event_loop
+
+def get_pipeline_settings():
+    """
+    BULK_LLM_CONCURRENCY: resumes parsed by the LLM at the same time (network bound, async).
+    BULK_PIPELINE_DEPTH: files read from the ZIP but not yet handed to the writer.
+    BULK_WRITE_BATCH_SIZE: parsed resumes written to the database per batch.
+    BULK_WRITE_BATCH_WINDOW: seconds a partial batch waits for more results before it is written.
+    Extraction workers, timeouts and memory limits come from get_extraction_settings().
+    """
+    extract_workers = get_extraction_settings()['workers']
+    llm_concurrency = int(os.getenv('BULK_LLM_CONCURRENCY', 16))
+    return {
+        'llm_concurrency': max(1, llm_concurrency),
+        'pipeline_depth': max(1, int(os.getenv('BULK_PIPELINE_DEPTH', 2 * (extract_workers + llm_concurrency)))),
+        'write_batch_size': max(1, int(os.getenv('BULK_WRITE_BATCH_SIZE', 25))),
+        'write_batch_window': max(0.0, float(os.getenv('BULK_WRITE_BATCH_WINDOW', 2)))
+    }
+
+class PipelineCancelled(Exception):
+    """Raised by run_pipeline when its cancel event was set before every file was written"""
+    pass
+
+def run_pipeline(members, load_member, extract_text, parse_text, write_batch, settings=None, cancelled=None):
+    """
+    Run resumes through three overlapping stages with bounded queues:
+      1. extract_text(file_bytes, filename) on extraction threads, which dispatch the work
+         to the sandboxed extraction pool (and may fan one file out into several jobs)
+      2. await parse_text(text) on the LLM gateway's event loop, capped at the LLM concurrency
+      3. write_batch(results) in the calling thread, one batch at a time
+    load_member(member) -> (filename, file_bytes, content_hash, context), or None to skip
+    the member, runs in a reader thread and blocks once pipeline_depth files are in flight,
+    so memory stays bounded.
+    Files already in the parse cache skip extraction (and the LLM, if their result is cached).
+    Every member produces exactly one result dict with filename, context and one of
+    parsed_data, error or skipped.
+    cancelled, a threading.Event, stops reading new members and writing batches once set;
+    run_pipeline then raises PipelineCancelled after draining the files in flight.
+    """
+    settings = settings or get_pipeline_settings()
+    if not members:
+        return
+
+    # The gateway's long-lived loop drives every LLM request of every job, instead of
+    # one blocked thread per request; the async client must stay on that one loop
+    llm_loop = get_event_loop()
+    extract_executor = ThreadPoolExecutor(
+        max_workers=get_extraction_settings()['workers'], thread_name_prefix='bulk-extract'
+    )
+    llm_semaphore = asyncio.Semaphore(settings['llm_concurrency'])
+    in_flight = threading.BoundedSemaphore(settings['pipeline_depth'])
+    results = queue.Queue(maxsize=settings['pipeline_depth'])
+
+    def finish(result):
+        results.put(result)
+        in_flight.release()
+
+    async def parse_stage(filename, context, content_hash, text):
+        try:
+            async with llm_semaphore:
+                parsed_data = await parse_text(text)
+            # SQLite writes block (up to the busy timeout), so keep them off the shared gateway loop
+            await llm_loop.run_in_executor(None, store_parse, content_hash, text, parsed_data)
+            finish({'filename': filename, 'context': context, 'parsed_data': parsed_data})
+        except Exception as e:
+            finish({'filename': filename, 'context': context, 'error': str(e)})
+
+    def submit_parse(filename, context, content_hash, text):
+        asyncio.run_coroutine_threadsafe(parse_stage(filename, context, content_hash, text), llm_loop)
+
+    def on_extracted(filename, context, content_hash, future):
+        try:
+            text = future.result()
+            submit_parse(filename, context, content_hash, text)
+        except Exception as e:
+            # Timed-out or crashed workers are replaced by the pool; only this file fails
+            finish({'filename': filename, 'context': context, 'error': f'Text extraction failed: {str(e)}'})
+
+    def reader():
+        for member in members:
+            in_flight.acquire()
+            filename = getattr(member, 'filename', str(member))
+            context = None
+            if cancelled is not None and cancelled.is_set():
+                finish({'filename': filename, 'context': None, 'cancelled': True})
+                continue
+            try:
+                loaded = load_member(member)
+                if loaded is None:
+                    finish({'filename': filename, 'context': None, 'skipped': True})
+                    continue
+                filename, file_bytes, content_hash, context = loaded
+
+                cached = get_cached_parse(content_hash)
+                if cached and cached['parsed_data'] is not None:
+                    finish({'filename': filename, 'context': context, 'parsed_data': cached['parsed_data']})
+                    continue
+                if cached:
+                    submit_parse(filename, context, content_hash, cached['resume_text'])
+                    continue
+
+                future = extract_executor.submit(extract_text, file_bytes, filename)
+                future.add_done_callback(
+                    lambda f, filename=filename, context=context, content_hash=content_hash:
+                        on_extracted(filename, context, content_hash, f)
+                )
+            except Exception as e:
+                finish({'filename': filename, 'context': context, 'error': str(e)})
+
+    reader_thread = threading.Thread(target=reader, name='bulk-reader', daemon=True)
+    reader_thread.start()
+
+    # Keep draining results even if a write fails, otherwise the reader blocks forever
+    write_error = None
+    remaining = len(members)
+    batch = []
+    batch_deadline = None
+    while remaining:
+        # Results trickle in at the LLM's pace, so a partial batch waits a short window
+        # for more rather than being written one row at a time
+        try:
+            timeout = None if not batch else max(0.0, batch_deadline - time.monotonic())
+            result = results.get(timeout=timeout)
+            if not batch:
+                batch_deadline = time.monotonic() + settings['write_batch_window']
+            batch.append(result)
+            remaining -= 1
+        except queue.Empty:
+            pass
+
+        # Write when the batch is full, the window has passed or every file is in
+        if batch and (len(batch) >= settings['write_batch_size'] or remaining == 0
+                      or time.monotonic() >= batch_deadline):
+            if write_error is None and not (cancelled is not None and cancelled.is_set()):
+                try:
+                    write_batch(batch)
+                except Exception as e:
+                    write_error = e
+            batch = []
+
+    reader_thread.join()
+    extract_executor.shutdown(wait=False)
+
+    if write_error is not None:
+        raise write_error
+    if cancelled is not None and cancelled.is_set():
+        raise PipelineCancelled()
@@ -0,0 +1,220 @@
+import os
+import shutil
+import zipfile
+import uuid
+from urllib.parse import quote
+from werkzeug.utils import secure_filename
+from database import db
+from utils import send_email, save_file_async
+from ResumeParser.main import parseResumeTextAsync
+from ResumeParser.readResume import readResumeSandboxed
+from ResumeParser.parseCache import hash_resume_bytes
+from Models.candidate import IngestedResume
+from .jobStore import set_files_found, record_file, finish_job
+from .pipeline import run_pipeline, PipelineCancelled
+from .candidateUpsert import upsert_parsed_resumes
+
+SUPPORTED_EXTENSIONS = ['.pdf', '.doc', '.docx', '.txt']
+
+class ZipLimitError(Exception):
+    """Raised when an uploaded ZIP exceeds the ingestion limits"""
+    pass
+
+def get_zip_limits():
+    """ZIP bomb guards, configurable through the environment"""
+    return {
+        'max_members': int(os.getenv('BULK_ZIP_MAX_MEMBERS', 1000)),
+        'max_member_size': int(os.getenv('BULK_ZIP_MAX_MEMBER_SIZE', 20 * 1024 * 1024)),
+        'max_total_size': int(os.getenv('BULK_ZIP_MAX_TOTAL_SIZE', 500 * 1024 * 1024)),
+        'max_ratio': float(os.getenv('BULK_ZIP_MAX_RATIO', 100))
+    }
+
+def list_resume_members(zip_ref, limits):
+    """
+    Supported resume members of the ZIP, after checking member count,
+    declared uncompressed sizes and compression ratios against the limits
+    """
+    members = [
+        info for info in zip_ref.infolist()
+        if not info.is_dir()
+        and not os.path.basename(info.filename).startswith('.')
+        and '__MACOSX' not in info.filename
+        and os.path.splitext(info.filename)[1].lower() in SUPPORTED_EXTENSIONS
+    ]
+
+    if len(members) > limits['max_members']:
+        raise ZipLimitError(f"ZIP contains {len(members)} resumes, the limit is {limits['max_members']}")
+
+    total_size = 0
+    for info in members:
+        if info.file_size > limits['max_member_size']:
+            raise ZipLimitError(f"{info.filename} is larger than {limits['max_member_size']} bytes uncompressed")
+        if info.compress_size and info.file_size / info.compress_size > limits['max_ratio']:
+            raise ZipLimitError(f"{info.filename} has a suspicious compression ratio")
+        total_size += info.file_size
+
+    if total_size > limits['max_total_size']:
+        raise ZipLimitError(f"ZIP expands to {total_size} bytes, the limit is {limits['max_total_size']}")
+
+    return members
+
+def read_member(zip_ref, info, limits):
+    """Read one member into memory, never trusting the declared size beyond the limit"""
+    with zip_ref.open(info) as member:
+        data = member.read(limits['max_member_size'] + 1)
+    if len(data) > limits['max_member_size']:
+        raise ZipLimitError(f"{info.filename} is larger than {limits['max_member_size']} bytes uncompressed")
+    return data
+
+def store_resume_copy(filename, file_bytes):
+    """Schedule the only stored copy of a resume to be written and return its relative path"""
+    upload_dir = os.path.join(os.getcwd(), 'Uploads', 'resumes')
+    os.makedirs(upload_dir, exist_ok=True)
+
+    # Unique per stored copy: members with the same name in one upload must not overwrite each other
+    new_filename = f"bulk_{uuid.uuid4().hex}_{secure_filename(os.path.basename(filename))}"
+    new_file_path = os.path.join(upload_dir, new_filename)
+
+    # Written in the background so the reader keeps feeding the pipeline
+    save_file_async(file_bytes, new_file_path)
+
+    return f"/Uploads/resumes/{new_filename}"
+
+def write_parsed_batch(job_id, company_job_id, batch):
+    """
+    Writer stage: persist a batch of pipeline results in one transaction.
+    If the batch fails (e.g. another upload created the same candidate meanwhile)
+    it is retried file by file so one bad resume does not fail its neighbours.
+    """
+    entries = []
+    for result in batch:
+        if result.get('skipped'):
+            record_file(job_id, result['filename'], 'skipped')
+            continue
+
+        if result.get('error'):
+            record_file(job_id, result['filename'], 'error', error=result['error'])
+            continue
+
+        parsed_data = result['parsed_data']
+        if parsed_data.get('error'):
+            record_file(job_id, result['filename'], 'error', error=parsed_data['error'])
+            continue
+
+        # Get candidate email from parsed data
+        candidate_email = parsed_data.get('candidate', {}).get('email')
+        if not candidate_email:
+            record_file(job_id, result['filename'], 'error', error='No email found in resume')
+            continue
+
+        entries.append({
+            'filename': result['filename'],
+            'email': candidate_email,
+            'relative_path': result['context']['relative_path'],
+            'content_hash': result['context']['content_hash'],
+            'parsed_data': parsed_data
+        })
+
+    if entries:
+        _write_entries(job_id, company_job_id, entries)
+
+def send_activation_email(email, name, token):
+    """Deliver the one-time token a bulk-created candidate needs to set a password"""
+    frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:5173')
+    send_email(
+        email,
+        'Activate your SenAI account',
+        f"Hi {name},\n\nAn account was created for you from your resume. "
+        f"Set your password here: {frontend_url}/activate?email={quote(email)}&token={token}"
+    )
+
+def _write_entries(job_id, company_job_id, entries):
+    try:
+        outcomes = upsert_parsed_resumes(company_job_id, entries)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        if len(entries) == 1:
+            record_file(job_id, entries[0]['filename'], 'error', error=str(e))
+            return
+        for entry in entries:
+            _write_entries(job_id, company_job_id, [entry])
+        return
+
+    for outcome in outcomes:
+        if outcome['activation_token']:
+            send_activation_email(outcome['email'], outcome['name'], outcome['activation_token'])
+        record_file(
+            job_id, outcome['filename'], 'done',
+            email=outcome['email'], name=outcome['name'],
+            created=outcome['created'], applied=outcome['applied']
+        )
+
+def get_ingested_hashes(company_job_id):
+    """Content hashes of every resume already ingested for this job, for O(1) skip checks"""
+    return {row.content_hash for row in db.session.query(IngestedResume.content_hash).filter(
+        IngestedResume.job_id == company_job_id
+    ).all()}
+
+def process_bulk_job(job):
+    """
+    Stream the job's ZIP through the staged pipeline: members are read from memory,
+    text is extracted in worker processes, parsed by the LLM concurrently and
+    written to the database in batches, recording per-file progress.
+    Files whose content was already ingested for the job (or appear twice in the ZIP)
+    are skipped before being stored or parsed.
+    """
+    job_id = job['job_id']
+    lease_owner = job.get('lease_owner')
+    lease_lost = job.get('lease_lost')
+    zip_path = job['zip_path']
+    temp_dir = os.path.dirname(zip_path)
+    limits = get_zip_limits()
+
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            try:
+                members = list_resume_members(zip_ref, limits)
+            except ZipLimitError as e:
+                finish_job(job_id, 'failed', str(e), lease_owner)
+                return
+
+            set_files_found(job_id, len(members))
+            for info in members:
+                record_file(job_id, info.filename, 'pending')
+
+            seen_hashes = get_ingested_hashes(job['company_id'])
+
+            def load_member(info):
+                record_file(job_id, info.filename, 'processing')
+                file_bytes = read_member(zip_ref, info, limits)
+
+                content_hash = hash_resume_bytes(file_bytes)
+                if content_hash in seen_hashes:
+                    return None
+                seen_hashes.add(content_hash)
+
+                context = {
+                    'relative_path': store_resume_copy(info.filename, file_bytes),
+                    'content_hash': content_hash
+                }
+                return info.filename, file_bytes, content_hash, context
+
+            run_pipeline(
+                members,
+                load_member,
+                readResumeSandboxed,
+                parseResumeTextAsync,
+                lambda batch: write_parsed_batch(job_id, job['company_id'], batch),
+                cancelled=lease_lost
+            )
+
+        finish_job(job_id, 'completed', 'Bulk upload processed successfully', lease_owner)
+
+    except PipelineCancelled:
+        print(f"Stopped bulk upload job {job_id}: it was requeued to another worker")
+
+    finally:
+        # Clean up the uploaded ZIP, unless the job now belongs to another worker
+        if lease_lost is None or not lease_lost.is_set():
+            shutil.rmtree(temp_dir, ignore_errors=True)
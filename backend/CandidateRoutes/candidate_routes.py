@@ -3,8 +3,10 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime
 import os
 from werkzeug.utils import secure_filename
-from ResumeParser.main import resumeParser
-from CandidateRoutes.utils import update_candidate_from_parsed_data
+from ResumeParser.main import resumeParserBytes
+from utils import save_file_async
+from CandidateRoutes.utils import update_candidate_from_parsed_data, bump_profile_version
+from ResumeShortlister.skillCanonicalizer import canonicalize_skill
 
 
 def register_candidate_routes(app):
@@ -92,6 +94,8 @@ def register_candidate_routes(app):
         if 'location' in data:
             candidate.location = data['location']
         if 'years_experience' in data:
+            if data['years_experience'] != candidate.years_experience:
+                bump_profile_version(candidate.candidate_id)
             candidate.years_experience = data['years_experience']
         if 'resume_file_path' in data:
             candidate.resume_file_path = data['resume_file_path']
@@ -134,6 +138,7 @@ def register_candidate_routes(app):
         )
         
         db.session.add(new_education)
+        bump_profile_version(user_id)
         db.session.commit()
         
         return jsonify({
@@ -177,6 +182,7 @@ def register_candidate_routes(app):
         if 'gpa' in data:
             education.gpa = data['gpa']
         
+        bump_profile_version(user_id)
         db.session.commit()
         
         return jsonify({'message': 'Education updated successfully'}), 200
@@ -201,6 +207,7 @@ def register_candidate_routes(app):
             return jsonify({'message': 'Education record not found'}), 404
         
         db.session.delete(education)
+        bump_profile_version(user_id)
         db.session.commit()
         
         return jsonify({'message': 'Education deleted successfully'}), 200
@@ -236,11 +243,13 @@ def register_candidate_routes(app):
         new_skill = Skills(
             candidate_id=user_id,
             skill_name=data.get('skill_name'),
+            canonical_skill=canonicalize_skill(data.get('skill_name')) or None,
             skill_category=skill_category,
             proficiency_level=proficiency_level
         )
         
         db.session.add(new_skill)
+        bump_profile_version(user_id)
         db.session.commit()
         
         return jsonify({
@@ -276,6 +285,7 @@ def register_candidate_routes(app):
         
         if 'skill_name' in data:
             skill.skill_name = data['skill_name']
+            skill.canonical_skill = canonicalize_skill(data['skill_name']) or None
         
         if 'skill_category' in data:
             try:
@@ -289,6 +299,7 @@ def register_candidate_routes(app):
             except ValueError:
                 return jsonify({'message': 'Invalid proficiency level'}), 400
         
+        bump_profile_version(user_id)
         db.session.commit()
         
         return jsonify({'message': 'Skill updated successfully'}), 200
@@ -313,6 +324,7 @@ def register_candidate_routes(app):
             return jsonify({'message': 'Skill not found'}), 404
         
         db.session.delete(skill)
+        bump_profile_version(user_id)
         db.session.commit()
         
         return jsonify({'message': 'Skill deleted successfully'}), 200
@@ -348,12 +360,13 @@ def register_candidate_routes(app):
         relative_path = f"/Uploads/resumes/{filename}"
         
         try:
-            # Save the file to filesystem
-            file.save(file_path)
-            parsed_data = resumeParser(file_path)
+            # Parse straight from the upload; the original is written in the background
+            file_bytes = file.read()
+            parsed_data = resumeParserBytes(file_bytes, secure_name)
             
             # Check if parsing was successful
             if parsed_data.get('error'):
+                save_file_async(file_bytes, file_path)
                 return jsonify({
                     'message': 'Resume uploaded but parsing failed',
                     'file_path': relative_path,
@@ -363,15 +376,15 @@ def register_candidate_routes(app):
             
             # Update candidate's resume path in database
             candidate = Candidate.query.filter_by(candidate_id=user_id).first()
+            old_file_path = None
             if candidate:
-                # Delete old resume file if exists
+                # The old resume file is deleted once the new one is written
                 if candidate.resume_file_path:
                     old_file_path = os.path.join(os.getcwd(), candidate.resume_file_path.lstrip('/'))
-                    if os.path.exists(old_file_path):
-                        os.remove(old_file_path)
                 
                 candidate.resume_file_path = relative_path
                 db.session.commit()
+            save_file_async(file_bytes, file_path, replaced_path=old_file_path)
             
             # Update candidate data from parsed resume
             print(f"Parsed Data: {parsed_data}")
@@ -1,7 +1,70 @@
 from Models.candidate import Candidate, Education, Skills, SkillCategory, ProficiencyLevel
 from database import db
+from ResumeShortlister.skillCanonicalizer import canonicalize_skill
 
 
+def bump_profile_version(candidate_id):
+    """Mark the candidate's shortlisting scores as stale; the caller commits"""
+    Candidate.query.filter_by(candidate_id=candidate_id).update(
+        {Candidate.profile_version: Candidate.profile_version + 1},
+        synchronize_session=False
+    )
+
+def get_profile_updates(candidate_data):
+    """Candidate columns to overwrite from the 'candidate' section of a parsed resume"""
+    updates = {}
+    if candidate_data.get('fullname'):
+        updates['fullname'] = candidate_data['fullname']
+    if candidate_data.get('phone'):
+        updates['phone'] = candidate_data['phone']
+    if candidate_data.get('location'):
+        updates['location'] = candidate_data['location']
+    if candidate_data.get('years_experience') is not None:
+        updates['years_experience'] = candidate_data['years_experience']
+    if candidate_data.get('experience'):
+        updates['experience'] = str(candidate_data['experience'])
+    return updates
+
+def build_education_rows(candidate_id, education_list):
+    """Education rows for a parsed resume, as column mappings"""
+    return [{
+        'candidate_id': candidate_id,
+        'degree': edu_data.get('degree'),
+        'institution': edu_data.get('institution'),
+        'graduation_year': edu_data.get('graduation_year'),
+        'gpa': edu_data.get('gpa')
+    } for edu_data in education_list or [] if edu_data.get('degree') or edu_data.get('institution')]
+
+def build_skill_rows(candidate_id, skills_list):
+    """Skill rows for a parsed resume, as column mappings with validated enum values"""
+    rows = []
+    for skill_data in skills_list or []:
+        if not skill_data.get('skill_name'):
+            continue
+
+        skill_category = None
+        if skill_data.get('skill_category'):
+            try:
+                skill_category = SkillCategory(skill_data['skill_category'])
+            except ValueError:
+                skill_category = SkillCategory.other
+
+        proficiency_level = None
+        if skill_data.get('proficiency_level'):
+            try:
+                proficiency_level = ProficiencyLevel(skill_data['proficiency_level'])
+            except ValueError:
+                proficiency_level = ProficiencyLevel.intermediate
+
+        rows.append({
+            'candidate_id': candidate_id,
+            'skill_name': skill_data['skill_name'],
+            'canonical_skill': canonicalize_skill(skill_data['skill_name']) or None,
+            'skill_category': skill_category,
+            'proficiency_level': proficiency_level
+        })
+    return rows
+
 def update_candidate_from_parsed_data(candidate_id, parsed_data):
         """Helper function to update candidate data from parsed resume"""
         try:
@@ -12,61 +75,32 @@ def update_candidate_from_parsed_data(candidate_id, parsed_data):
             
             
             # Update candidate profile data
-            candidate_data = parsed_data.get('candidate', {})
-            if candidate_data.get('fullname'):
-                candidate.fullname = candidate_data['fullname']
-            if candidate_data.get('phone'):
-                candidate.phone = candidate_data['phone']
-            if candidate_data.get('location'):
-                candidate.location = candidate_data['location']
-            if candidate_data.get('years_experience') is not None:
-                candidate.years_experience = candidate_data['years_experience']
-            if candidate_data.get('experience'):
-                candidate.experience = str(candidate_data['experience'])
+            for column, value in get_profile_updates(parsed_data.get('candidate', {})).items():
+                setattr(candidate, column, value)
             
             # Clear existing education and skills to replace with new data
             Education.query.filter_by(candidate_id=candidate_id).delete()
             Skills.query.filter_by(candidate_id=candidate_id).delete()
             
-            # Add education records
-            education_list = parsed_data.get('education', [])
-            for edu_data in education_list:
-                if edu_data.get('degree') or edu_data.get('institution'):
-                    new_education = Education(
-                        candidate_id=candidate_id,
-                        degree=edu_data.get('degree'),
-                        institution=edu_data.get('institution'),
-                        graduation_year=edu_data.get('graduation_year'),
-                        gpa=edu_data.get('gpa')
-                    )
-                    db.session.add(new_education)
+            # Add education and skills records
+            for row in build_education_rows(candidate_id, parsed_data.get('education', [])):
+                db.session.add(Education(**row))
+            for row in build_skill_rows(candidate_id, parsed_data.get('skills', [])):
+                db.session.add(Skills(**row))
+            
+            # Skills, education and experience were replaced, so existing scores are stale
+            candidate.profile_version = (candidate.profile_version or 1) + 1
             
-            # Add skills records
-            skills_list = parsed_data.get('skills', [])
-            for skill_data in skills_list:
-                if skill_data.get('skill_name'):
-                    # Validate enum values
-                    skill_category = None
-                    if skill_data.get('skill_category'):
-                        try:
-                            skill_category = SkillCategory(skill_data['skill_category'])
-                        except ValueError:
-                            skill_category = SkillCategory.other
-                    
-                    proficiency_level = None
-                    if skill_data.get('proficiency_level'):
-                        try:
-                            proficiency_level = ProficiencyLevel(skill_data['proficiency_level'])
-                        except ValueError:
-                            proficiency_level = ProficiencyLevel.intermediate
-                    
-                    new_skill = Skills(
-                        candidate_id=candidate_id,
-                        skill_name=skill_data['skill_name'],
-                        skill_category=skill_category,
-                        proficiency_level=proficiency_level
-                    )
-                    db.session.add(new_skill)
+            # Embed the experience once at ingest time so shortlisting only needs a lookup;
+            # the savepoint keeps a failed embedding write from aborting the update
+            db.session.flush()
+            try:
+                from ResumeShortlister.embeddingStore import store_experience_embedding
+                with db.session.begin_nested():
+                    store_experience_embedding(candidate_id, candidate.experience)
+            except Exception as e:
+                # Shortlisting backfills missing embeddings, so this must not block the update
+                print(f"Error storing experience embedding: {str(e)}")
             
             db.session.commit()
             return {'success': True, 'message': 'Candidate data updated successfully'}
@@ -1,13 +1,11 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 import os
-import zipfile
 from werkzeug.utils import secure_filename
 import uuid
-import bcrypt
-from datetime import datetime
-from ResumeParser.main import resumeParser
 from Models.candidate import Candidate, AppliedCandidate
+from BulkIngestion.jobStore import create_job, get_job_status
+from BulkIngestion.jobQueue import ensure_workers_started, notify_new_job
 
 
 def register_company_routes(app):
@@ -61,6 +59,11 @@ def register_company_routes(app):
         
         data = request.get_json()
         
+        # Shortlisting scores depend on these fields, so invalidate them on change
+        scoring_fields = ('skills_required', 'education_qualification', 'description')
+        if any(field in data and data[field] != getattr(company, field) for field in scoring_fields):
+            company.scoring_version = (company.scoring_version or 1) + 1
+        
         # Update fields if provided
         if 'companyName' in data:
             company.company_name = data['companyName']
@@ -144,146 +147,49 @@ def register_company_routes(app):
             if not zip_file.filename.endswith('.zip'):
                 return jsonify({'message': 'Only ZIP files are supported for bulk upload'}), 400
             
-            # Create temporary directory for extraction
+            # Save the uploaded zip file for the background workers
             temp_dir = os.path.join(os.getcwd(), 'Uploads', 'temp', f'bulk_{uuid.uuid4().hex}')
             os.makedirs(temp_dir, exist_ok=True)
             
-            # Save the uploaded zip file
             zip_path = os.path.join(temp_dir, secure_filename(zip_file.filename))
             zip_file.save(zip_path)
             
-            # Extract the zip file
-            extract_dir = os.path.join(temp_dir, 'extracted')
-            os.makedirs(extract_dir, exist_ok=True)
-            
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            
-            # Process each file in the extracted directory
-            uploaded_count = 0
-            errors = []
-            candidates_created = []
-            candidates_applied = []
-            
-            for root, _, files in os.walk(extract_dir):
-                for filename in files:
-                    file_path = os.path.join(root, filename)
-                    file_ext = os.path.splitext(filename)[1].lower()
-                    
-                    # Check if it's a supported file type
-                    if file_ext in ['.pdf', '.doc', '.docx', '.txt']:
-                        try:
-                            # Move file to permanent storage
-                            upload_dir = os.path.join(os.getcwd(), 'Uploads', 'resumes')
-                            os.makedirs(upload_dir, exist_ok=True)
-                            
-                            timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-                            new_filename = f"bulk_{timestamp}_{secure_filename(filename)}"
-                            new_file_path = os.path.join(upload_dir, new_filename)
-                            
-                            # Copy file to new location
-                            with open(file_path, 'rb') as src, open(new_file_path, 'wb') as dst:
-                                dst.write(src.read())
-                                
-                            relative_path = f"/Uploads/resumes/{new_filename}"
-                            
-                            # Parse resume
-                            parsed_data = resumeParser(new_file_path)
-                            print(f"Parsed Data for {filename}: {parsed_data}")
-                            
-                            if parsed_data.get('error'):
-                                errors.append({
-                                    'filename': filename,
-                                    'error': parsed_data['error']
-                                })
-                                continue
-                            
-                            # Get candidate email from parsed data
-                            candidate_email = parsed_data.get('candidate', {}).get('email')
-                            
-                            if not candidate_email:
-                                errors.append({
-                                    'filename': filename,
-                                    'error': 'No email found in resume'
-                                })
-                                continue
-                            
-                            # Check if candidate already exists
-                            existing_candidate = Candidate.query.filter_by(email=candidate_email).first()
-                            
-                            if existing_candidate:
-                                candidate = existing_candidate
-                            else:
-                                # Create new candidate with default password
-                                hashed_password = bcrypt.hashpw("12345678".encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-                                
-                                candidate = Candidate(
-                                    email=candidate_email,
-                                    fullname=parsed_data.get('candidate', {}).get('fullname') or 'New Candidate',
-                                    phone=parsed_data.get('candidate', {}).get('phone'),
-                                    location=parsed_data.get('candidate', {}).get('location'),
-                                    years_experience=parsed_data.get('candidate', {}).get('years_experience'),
-                                    experience=parsed_data.get('candidate', {}).get('experience'),
-                                    resume_file_path=relative_path,
-                                    password=hashed_password
-                                )
-                                
-                                db.session.add(candidate)
-                                db.session.flush()  # Get the candidate_id before committing
-                                candidates_created.append({
-                                    'email': candidate_email,
-                                    'name': candidate.fullname
-                                })
-                            
-                            # Check if candidate has already applied to this job
-                            existing_application = AppliedCandidate.query.filter_by(
-                                candidate_id=candidate.candidate_id,
-                                job_id=company.job_id
-                            ).first()
-                            
-                            if not existing_application:
-                                # Create application entry
-                                application = AppliedCandidate(
-                                    candidate_id=candidate.candidate_id,
-                                    job_id=company.job_id
-                                )
-                                db.session.add(application)
-                                candidates_applied.append({
-                                    'email': candidate_email,
-                                    'name': candidate.fullname
-                                })
-                            
-                            # Update candidate profile with parsed data
-                            from CandidateRoutes.utils import update_candidate_from_parsed_data
-                            update_candidate_from_parsed_data(candidate.candidate_id, parsed_data)
-                            
-                            uploaded_count += 1
-                            
-                        except Exception as e:
-                            errors.append({
-                                'filename': filename,
-                                'error': str(e)
-                            })
-            
-            # Commit all database changes
-            db.session.commit()
-            
-            # Clean up temporary directory
-            import shutil
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            # Queue the job; parsing happens in the background worker pool
+            job_id = create_job(company.job_id, zip_path, zip_file.filename)
+            ensure_workers_started(current_app._get_current_object())
+            notify_new_job()
             
             return jsonify({
-                'message': 'Bulk upload processed successfully',
-                'total_files': uploaded_count,
-                'candidates_created': candidates_created,
-                'candidates_applied': candidates_applied,
-                'errors': errors
-            }), 200
+                'message': 'Bulk upload queued for processing',
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/company/bulkUpload/{job_id}'
+            }), 202
             
         except Exception as e:
-            db.session.rollback()
             return jsonify({'message': f'Error processing bulk upload: {str(e)}'}), 500
 
+    @app.route('/api/company/bulkUpload/<job_id>', methods=['GET'])
+    @jwt_required()
+    def get_bulk_upload_status(job_id):
+        """Get progress of a bulk upload job"""
+        user_id = int(get_jwt_identity())
+        claims = get_jwt()
+        
+        # Verify user is a company
+        if claims.get('type') != 'company':
+            return jsonify({'message': 'Unauthorized access'}), 403
+        
+        job_status = get_job_status(job_id)
+        if not job_status or job_status['company_id'] != user_id:
+            return jsonify({'message': 'Bulk upload job not found'}), 404
+        
+        # Make sure this process can pick up queued jobs as well
+        if job_status['status'] == 'queued':
+            ensure_workers_started(current_app._get_current_object())
+        
+        return jsonify(job_status), 200
+
     @app.route('/api/company/dashboard/stats', methods=['GET'])
     @jwt_required()
     def get_company_dashboard_stats():
@@ -36,6 +36,11 @@ class Candidate(db.Model):
     created_at = db.Column(db.DateTime, server_default=func.now())
     updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now())
     experience = db.Column(db.Text, nullable=True)
+    # Bumped whenever skills, education or experience change, so stale scores can be detected
+    profile_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    # Bulk-created accounts have no usable password until activated with this one-time token
+    activation_token_hash = db.Column(db.String(64), nullable=True)
+    activation_expires_at = db.Column(db.DateTime, nullable=True)
 
     # Relationships
     education = db.relationship('Education', backref='candidate', lazy=True, cascade='all, delete-orphan')
@@ -65,12 +70,33 @@ class Skills(db.Model):
     skill_id = db.Column(db.Integer, primary_key=True)
     candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'), nullable=False)
     skill_name = db.Column(db.String(255), nullable=True)
+    canonical_skill = db.Column(db.String(255), nullable=True)
     skill_category = db.Column(db.Enum(SkillCategory), nullable=True)
     proficiency_level = db.Column(db.Enum(ProficiencyLevel), nullable=True)
+    
+    # Inverted index from canonical skill to candidates, used to prefilter shortlisting
+    __table_args__ = (
+        db.Index('ix_skills_canonical_candidate', 'canonical_skill', 'candidate_id'),
+    )
 
     def __repr__(self):
         return f"<Skill '{self.skill_name}' - {self.proficiency_level}>"
     
+class ExperienceEmbedding(db.Model):
+    """Experience embedding computed at ingest time, tagged with the model that produced it"""
+    __tablename__ = "experience_embeddings"
+    
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'), primary_key=True)
+    model_tag = db.Column(db.String(100), nullable=False)
+    text_hash = db.Column(db.String(64), nullable=False)
+    embedding = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now())
+    
+    candidate = db.relationship('Candidate', backref=db.backref('experience_embedding', uselist=False, lazy=True, cascade='all, delete-orphan'))
+    
+    def __repr__(self):
+        return f"<ExperienceEmbedding candidate {self.candidate_id} ({self.model_tag})>"
+
 class AppliedCandidate(db.Model):
     """Model for tracking job applications by candidates"""
     __tablename__ = "appliedcandidates"
@@ -81,6 +107,14 @@ class AppliedCandidate(db.Model):
     applied_at = db.Column(db.DateTime, server_default=func.now())
     shortlisted = db.Column(db.Boolean, default=False)
     compatibility_score = db.Column(db.Float, default=0.0, nullable=False)
+    # Component scores from the last shortlisting run
+    skill_score = db.Column(db.Float, nullable=True)
+    experience_score = db.Column(db.Float, nullable=True)
+    education_passed = db.Column(db.Boolean, nullable=True)
+    score_details = db.Column(db.JSON, nullable=True)
+    # Versions of the job and candidate profile the scores above were computed against
+    scored_job_version = db.Column(db.Integer, nullable=True)
+    scored_profile_version = db.Column(db.Integer, nullable=True)
     
     # Define relationships
     candidate = db.relationship('Candidate', backref=db.backref('applications', lazy=True))
@@ -93,3 +127,15 @@ class AppliedCandidate(db.Model):
     
     def __repr__(self):
         return f"<Application {self.application_id}: Candidate {self.candidate_id} for Job {self.job_id}>"
+
+class IngestedResume(db.Model):
+    """Manifest of resume files already ingested for a job, keyed by content hash"""
+    __tablename__ = "ingested_resumes"
+    
+    job_id = db.Column(db.Integer, db.ForeignKey('companies.job_id', ondelete='CASCADE'), primary_key=True)
+    content_hash = db.Column(db.String(64), primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'), nullable=False)
+    ingested_at = db.Column(db.DateTime, server_default=func.now())
+    
+    def __repr__(self):
+        return f"<IngestedResume {self.content_hash[:12]} for Job {self.job_id}>"
@@ -20,6 +20,8 @@ class Company(db.Model):
     posted_date = db.Column(db.Date, default=datetime.utcnow().date())
     application_deadline = db.Column(db.Date, nullable=True)
     profile_completed = db.Column(db.Boolean, default=False)
+    # Bumped whenever fields used for shortlisting change, so stale scores can be detected
+    scoring_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     def __repr__(self):
         return f"<Job '{self.job_role}' at '{self.company_name}'>"
\ No newline at end of file
@@ -1,123 +1,276 @@
-from ResumeParser.readResume import readResume
 import os
 import json
-import re
-from dotenv import load_dotenv
-from google import genai
+import asyncio
+from ResumeParser.llmGateway import generate_content, generate_content_async, get_gateway_settings
+from ResumeParser.jsonRepair import repair_json
+from ResumeParser.preExtract import pre_extract
 
-# Load environment variables
-load_dotenv()
+def _nullable(schema_type, description=None, **extra):
+    field = {'type': schema_type, 'nullable': True, **extra}
+    if description:
+        field['description'] = description
+    return field
 
-def LLMParser(resume_text):
+# Structured output schema mirroring the Candidate, Education and Skills models
+RESUME_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'candidate': {
+            'type': 'OBJECT',
+            'properties': {
+                'fullname': _nullable('STRING'),
+                'email': _nullable('STRING'),
+                'phone': _nullable('STRING', 'Digits only, without special characters'),
+                'location': _nullable('STRING'),
+                'years_experience': _nullable('NUMBER', 'Estimated from work history if not stated'),
+                'experience': _nullable('STRING', 'Summary of the experience section, including years of experience')
+            },
+            'required': ['fullname', 'email', 'phone', 'location', 'years_experience', 'experience']
+        },
+        'education': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'degree': _nullable('STRING'),
+                    'institution': _nullable('STRING'),
+                    'graduation_year': _nullable('INTEGER'),
+                    'gpa': _nullable('NUMBER', 'GPA or CGPA rounded to 2 decimal places')
+                },
+                'required': ['degree', 'institution', 'graduation_year', 'gpa']
+            }
+        },
+        'skills': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'skill_name': {'type': 'STRING'},
+                    'skill_category': {'type': 'STRING', 'enum': ['technical', 'soft', 'language', 'other']},
+                    'proficiency_level': {'type': 'STRING', 'enum': ['beginner', 'intermediate', 'advanced', 'expert']}
+                },
+                'required': ['skill_name', 'skill_category', 'proficiency_level']
+            }
+        }
+    },
+    'required': ['candidate', 'education', 'skills']
+}
+
+# Ask Gemini to answer with JSON conforming to RESUME_SCHEMA
+GENERATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': RESUME_SCHEMA
+}
+
+PROFICIENCY_LEVELS = ['beginner', 'intermediate', 'advanced', 'expert']
+
+def use_hybrid_parser():
     """
-    Extract candidate data from resume using Gemini 2.0 Flash
-    Returns structured data matching the Candidate, Education, and Skills models
+    HYBRID_PARSER (default true): extract email, phone, years of experience and known
+    skills locally and only ask the LLM for what still needs interpretation
     """
-    try:
-        
-        if not resume_text:
-            return {
-                'error': 'Could not extract text from resume file',
-                'candidate': None,
-                'education': [],
-                'skills': []
+    return os.getenv('HYBRID_PARSER', 'true').lower() == 'true'
+
+def build_hybrid_schema(pre_extracted):
+    """Smaller output schema: only the candidate fields not found locally, plus levels for known skills"""
+    candidate_fields = dict(RESUME_SCHEMA['properties']['candidate']['properties'])
+    for field in ('email', 'phone', 'years_experience'):
+        if pre_extracted[field] is not None:
+            del candidate_fields[field]
+
+    properties = {
+        'candidate': {
+            'type': 'OBJECT',
+            'properties': candidate_fields,
+            'required': list(candidate_fields.keys())
+        },
+        'education': RESUME_SCHEMA['properties']['education'],
+        'additional_skills': RESUME_SCHEMA['properties']['skills']
+    }
+    if pre_extracted['skills']:
+        properties['skill_levels'] = {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'skill_name': {'type': 'STRING', 'enum': [skill['skill_name'] for skill in pre_extracted['skills']]},
+                    'proficiency_level': {'type': 'STRING', 'enum': PROFICIENCY_LEVELS}
+                },
+                'required': ['skill_name', 'proficiency_level']
             }
+        }
 
-        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-        
-        # Create detailed prompt for data extraction
-        prompt = f"""
-        You are an expert resume parser. Extract the following information from this resume text and return it as a JSON object.
+    return {
+        'type': 'OBJECT',
+        'properties': properties,
+        'required': list(properties.keys())
+    }
+
+def build_hybrid_prompt(pre_extracted):
+    """Prompt for the hybrid parser; the resume text excludes lines that were fully extracted locally"""
+    known_skills = ', '.join(skill['skill_name'] for skill in pre_extracted['skills']) or 'none'
+    prompt = f"""
+        You are an expert resume parser. Contact details and some skills were already extracted; extract the remaining information from this resume text.
+
+        Already extracted skills: {known_skills}
 
         IMPORTANT RULES:
-        1. Return ONLY valid JSON, no additional text or explanation
-        2. If information is not found, use null for that field
-        3. For skills, categorize them as: 'technical', 'soft', 'language', or 'other'
-        4. For proficiency levels, use: 'beginner', 'intermediate', 'advanced', or 'expert'
-        5. Extract years of experience as a number (estimate if needed based on work history)
-        6. For phone numbers, extract in clean format without special characters
-        7. Extract all education entries and all skills
-        8. GPA also known as CGPA should be extracted and rounded to 2 decimal places
-        9. Ensure all fields are present in the JSON structure, even if null
-        10. For proficiency levels, use the most appropriate level based on the context of the experiance/PROFESSIONAL BACKGROUND and projects mentioned in the resume
-        11. If a field is not applicable, set it to null
-
-        Expected JSON structure:
-        {{
-            "candidate": {{
-                "fullname": "string",
-                "email": "string", 
-                "phone": "string",
-                "location": "string",
-                "years_experience": number,
-                "experience": "summary text of experiance section from resume (also include years of experience)"
-            }},
-            "education": [
-                {{
-                    "degree": "string",
-                    "institution": "string", 
-                    "graduation_year": number,
-                    "gpa": number
-                }}
-            ],
-            "skills": [
-                {{
-                    "skill_name": "string",
-                    "skill_category": "technical|soft|language|other",
-                    "proficiency_level": "beginner|intermediate|advanced|expert"
-                }}
-            ],
-            
-        }}
+        1. If information is not found or not applicable, use null for that field
+        2. In skill_levels, rate each already extracted skill as 'beginner', 'intermediate', 'advanced' or 'expert' based on the context of the experiance/PROFESSIONAL BACKGROUND and projects mentioned in the resume
+        3. In additional_skills, list only skills that are not already extracted, categorized as 'technical', 'soft', 'language', or 'other'
+        4. GPA also known as CGPA should be extracted and rounded to 2 decimal places
+
+        Resume text to parse:
+        {pre_extracted['remaining_text']}
+        """
+    return prompt
+
+def merge_pre_extracted(pre_extracted, llm_data):
+    """Combine local extraction with the LLM answer into the usual candidate/education/skills structure"""
+    if llm_data.get('error'):
+        return llm_data
+
+    candidate = dict(llm_data.get('candidate') or {})
+    for field in ('email', 'phone', 'years_experience'):
+        if pre_extracted[field] is not None:
+            candidate[field] = pre_extracted[field]
+
+    levels = {
+        item['skill_name'].lower(): item.get('proficiency_level')
+        for item in llm_data.get('skill_levels') or []
+        if isinstance(item, dict) and isinstance(item.get('skill_name'), str)
+    }
+    skills = [{
+        **skill,
+        'proficiency_level': levels.get(skill['skill_name'].lower()) or 'intermediate'
+    } for skill in pre_extracted['skills']]
+
+    known = {skill['skill_name'].lower() for skill in skills}
+    for skill in llm_data.get('additional_skills') or []:
+        if isinstance(skill, dict) and isinstance(skill.get('skill_name'), str) and skill['skill_name'].lower() not in known:
+            skills.append(skill)
+            known.add(skill['skill_name'].lower())
+
+    return {
+        'candidate': candidate,
+        'education': llm_data.get('education') or [],
+        'skills': skills
+    }
+
+def prepare_request(resume_text):
+    """Prompt, generation config and local extraction (None in full-LLM mode) for one resume"""
+    if not use_hybrid_parser():
+        return build_prompt(resume_text), GENERATION_CONFIG, None
+
+    pre_extracted = pre_extract(resume_text)
+    config = {
+        'response_mime_type': 'application/json',
+        'response_schema': build_hybrid_schema(pre_extracted)
+    }
+    return build_hybrid_prompt(pre_extracted), config, pre_extracted
+
+def finish_response(response, pre_extracted):
+    parsed_data = parse_llm_response(response)
+    if pre_extracted is None:
+        return parsed_data
+    return merge_pre_extracted(pre_extracted, parsed_data)
+
+def _error_result(message):
+    return {
+        'error': message,
+        'candidate': None,
+        'education': [],
+        'skills': []
+    }
+
+def build_prompt(resume_text):
+    """Prompt asking Gemini for the Candidate, Education and Skills structure"""
+    # Create detailed prompt for data extraction
+    prompt = f"""
+        You are an expert resume parser. Extract the candidate details, all education entries and all skills from this resume text.
+
+        IMPORTANT RULES:
+        1. If information is not found or not applicable, use null for that field
+        2. For skills, categorize them as: 'technical', 'soft', 'language', or 'other'
+        3. For proficiency levels, use the most appropriate of 'beginner', 'intermediate', 'advanced' or 'expert' based on the context of the experiance/PROFESSIONAL BACKGROUND and projects mentioned in the resume
+        4. Extract years of experience as a number (estimate if needed based on work history)
+        5. For phone numbers, extract in clean format without special characters
+        6. GPA also known as CGPA should be extracted and rounded to 2 decimal places
 
         Resume text to parse:
         {resume_text}
         """
+    return prompt
 
-        # Generate content using Gemini
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt
-        )
-        
-        # Extract and clean the response
-        response_text = response.text.strip()
-        # print(f"Raw response from AI: {response_text}")
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Parse JSON response
+def parse_llm_response(response):
+    """
+    Turn the model output into a dict, or an error result.
+    Schema-constrained output decodes in one step; anything else goes through repair_json.
+    """
+    # The SDK may already have decoded the schema-constrained JSON
+    parsed = getattr(response, 'parsed', None)
+    if isinstance(parsed, dict):
+        return parsed
+
+    response_text = response.text or ''
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError as e:
         try:
-            parsed_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
+            return repair_json(response_text)
+        except ValueError:
             print(f"JSON parsing error: {e}")
             print(f"Raw response: {response_text}")
-            return {
-                'error': f'Invalid JSON response from AI: {str(e)}',
-                'candidate': None,
-                'education': [],
-                'skills': []
-            }
-        
-        
-        
-        
-        return parsed_data
+            return _error_result(f'Invalid JSON response from AI: {str(e)}')
+
+def LLMParser(resume_text):
+    """
+    Extract candidate data from resume using Gemini 2.0 Flash
+    Returns structured data matching the Candidate, Education, and Skills models
+    """
+    try:
+        if not resume_text:
+            return _error_result('Could not extract text from resume file')
+
+        prompt, config, pre_extracted = prepare_request(resume_text)
+
+        # Generate content using Gemini through the shared, rate-limited gateway
+        response = generate_content(prompt, config=config)
+        return finish_response(response, pre_extracted)
         
     except Exception as e:
         print(f"Error in LLMParser: {str(e)}")
-        return {
-            'error': f'Error processing resume: {str(e)}',
-            'candidate': None,
-            'education': [],
-            'skills': []
-        }
+        return _error_result(f'Error processing resume: {str(e)}')
+
+async def LLMParserAsync(resume_text):
+    """Async form of LLMParser; awaits the Gemini request instead of blocking a thread"""
+    try:
+        if not resume_text:
+            return _error_result('Could not extract text from resume file')
+
+        prompt, config, pre_extracted = prepare_request(resume_text)
+
+        response = await generate_content_async(prompt, config=config)
+        return finish_response(response, pre_extracted)
+        
+    except Exception as e:
+        print(f"Error in LLMParserAsync: {str(e)}")
+        return _error_result(f'Error processing resume: {str(e)}')
+
+async def LLMParserBatchAsync(resume_texts, concurrency=None):
+    """
+    Parse many resume texts concurrently, at most `concurrency` requests at a time
+    (defaults to LLM_MAX_IN_FLIGHT). Results are returned in input order; a failed
+    item gets an error result instead of failing the batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency or get_gateway_settings()['max_in_flight'])
+
+    async def parse_one(resume_text):
+        async with semaphore:
+            return await LLMParserAsync(resume_text)
+
+    return await asyncio.gather(*(parse_one(resume_text) for resume_text in resume_texts))
 
+def LLMParserBatch(resume_texts, concurrency=None):
+    """Blocking wrapper around LLMParserBatchAsync for callers without an event loop"""
+    return asyncio.run(LLMParserBatchAsync(resume_texts, concurrency))
@@ -0,0 +1,200 @@
+import os
+import re
+
+# Canonical resume sections and the headings that start them
+SECTION_HEADINGS = {
+    'summary': ['summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me', 'about'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment', 'employment history',
+                   'work history', 'career history', 'internships', 'internship', 'experience and internships'],
+    'education': ['education', 'academic', 'academics', 'academic background', 'educational qualifications',
+                  'qualifications', 'education and training'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'competencies', 'technologies',
+               'tools', 'tech stack', 'expertise', 'areas of expertise', 'soft skills'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'certifications': ['certifications', 'certificates', 'courses', 'training', 'licenses'],
+    'achievements': ['achievements', 'awards', 'honors', 'honours', 'accomplishments'],
+    'publications': ['publications', 'papers', 'research', 'patents', 'conferences', 'presentations'],
+    'other': ['languages', 'interests', 'hobbies', 'volunteering', 'volunteer experience', 'extracurricular activities',
+              'activities', 'positions of responsibility', 'personal details'],
+    'references': ['references'],
+    'declaration': ['declaration']
+}
+_HEADING_LOOKUP = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Share of the token budget per section; lines before the first heading are the header
+SECTION_WEIGHTS = {
+    'header': 0.08,
+    'summary': 0.06,
+    'experience': 0.34,
+    'education': 0.12,
+    'skills': 0.10,
+    'projects': 0.14,
+    'certifications': 0.05,
+    'achievements': 0.04,
+    'publications': 0.03,
+    'other': 0.04
+}
+# Sections that never help parsing
+DROPPED_SECTIONS = {'references', 'declaration'}
+
+BOILERPLATE_PATTERNS = [
+    re.compile(r'^(page\s*)?\d+(\s*(of|/)\s*\d+)?$', re.IGNORECASE),
+    re.compile(r'^(curriculum vitae|resume|résumé|cv)$', re.IGNORECASE),
+    re.compile(r'references (are )?available (up)?on request', re.IGNORECASE)
+]
+
+def get_token_budget():
+    """Upper bound on the resume text sent to the LLM, in tokens (RESUME_TOKEN_BUDGET)"""
+    return int(os.getenv('RESUME_TOKEN_BUDGET', 3000))
+
+def normalize_line(line):
+    return re.sub(r'\s+', ' ', line or '').strip()
+
+def detect_heading(line, emphasised=False):
+    """
+    Canonical section name if the line is a section heading, otherwise None.
+    Emphasised lines (bold, larger font, heading style) may be a little longer.
+    """
+    text = normalize_line(line).rstrip(':').strip()
+    words = text.split()
+    if not words or len(words) > (6 if emphasised else 4):
+        return None
+
+    key = re.sub(r'[^a-z ]+', ' ', text.lower().replace('&', ' and '))
+    key = re.sub(r'\s+', ' ', key).strip()
+    if key in _HEADING_LOOKUP:
+        return _HEADING_LOOKUP[key]
+
+    # "Professional Experience & Internships", "Skills Summary"
+    if emphasised or text.isupper():
+        for heading, name in _HEADING_LOOKUP.items():
+            if key.startswith(heading + ' ') or key.endswith(' ' + heading):
+                return name
+    return None
+
+def split_sections(lines):
+    """
+    Group (text, emphasised) lines, or plain strings, into ordered sections:
+    a list of {'name': ..., 'lines': [...]} starting with the header
+    """
+    sections = [{'name': 'header', 'lines': []}]
+    for item in lines:
+        text, emphasised = item if isinstance(item, tuple) else (item, False)
+        heading = detect_heading(text, emphasised)
+        if heading:
+            sections.append({'name': heading, 'lines': []})
+        else:
+            sections[-1]['lines'].append(text)
+    return sections
+
+def _furniture_key(text):
+    # Page numbers change from page to page
+    return re.sub(r'\d+', '#', normalize_line(text).lower())
+
+def strip_page_furniture(pages, edge_lines=3):
+    """
+    Drop running headers and footers: lines within edge_lines of the top or bottom of a page
+    (fewer on short pages) whose text, ignoring numbers, recurs at the edges of at least half the pages.
+    Pages are lists of lines, each a string or a tuple starting with the text.
+    Lines repeated in the body, such as a second "Software Engineer" role, are kept.
+    """
+    if len(pages) < 2:
+        return pages
+
+    def text_of(item):
+        return item[0] if isinstance(item, tuple) else item
+
+    def edge_count(page):
+        # Short pages would otherwise be all edge
+        return min(edge_lines, len(page) // 4)
+
+    counts = {}
+    for page in pages:
+        edge = edge_count(page)
+        if not edge:
+            continue
+        edges = page[:edge] + page[-edge:]
+        for key in {_furniture_key(text_of(item)) for item in edges}:
+            counts[key] = counts.get(key, 0) + 1
+
+    threshold = max(2, (len(pages) + 1) // 2)
+    furniture = {key for key, count in counts.items() if key and count >= threshold}
+    if not furniture:
+        return pages
+
+    return [[
+        item for idx, item in enumerate(page)
+        if not ((idx < edge_count(page) or idx >= len(page) - edge_count(page))
+                and _furniture_key(text_of(item)) in furniture)
+    ] for page in pages]
+
+def _is_boilerplate(line):
+    return any(pattern.search(line) for pattern in BOILERPLATE_PATTERNS)
+
+def _section_caps(sizes, budget_chars):
+    """
+    Per-section character caps; budget left by short or missing sections
+    goes to the longer ones, largest share first
+    """
+    caps = {name: int(SECTION_WEIGHTS.get(name, SECTION_WEIGHTS['other']) * budget_chars) for name in sizes}
+    leftover = budget_chars - sum(min(caps[name], size) for name, size in sizes.items())
+    for name in sorted(sizes, key=lambda name: -SECTION_WEIGHTS.get(name, 0)):
+        if leftover <= 0:
+            break
+        extra = min(leftover, max(0, sizes[name] - caps[name]))
+        caps[name] += extra
+        leftover -= extra
+    return caps
+
+def compact_sections(sections, token_budget=None):
+    """
+    Render sections to prompt text that fits the token budget (about four characters per token):
+    whitespace is collapsed, boilerplate and immediately repeated lines are dropped, sections
+    with the same name are merged and each is capped to its share. Running page headers and
+    footers are removed per page beforehand (strip_page_furniture).
+    """
+    budget_chars = (token_budget or get_token_budget()) * 4
+
+    merged = {}
+    for section in sections:
+        if section['name'] in DROPPED_SECTIONS:
+            continue
+        kept = merged.setdefault(section['name'], [])
+        for line in section['lines']:
+            line = normalize_line(line)
+            if not line or _is_boilerplate(line) or (kept and kept[-1].lower() == line.lower()):
+                continue
+            kept.append(line)
+    merged = {name: lines for name, lines in merged.items() if lines}
+
+    sizes = {name: sum(len(line) + 1 for line in lines) for name, lines in merged.items()}
+    caps = _section_caps(sizes, budget_chars)
+
+    parts = []
+    for name, lines in merged.items():
+        kept = []
+        used = 0
+        for line in lines:
+            if used + len(line) + 1 > caps[name]:
+                # Keep the start of an overlong line rather than nothing
+                remaining = caps[name] - used - 1
+                if remaining >= 40:
+                    kept.append(line[:remaining])
+                break
+            kept.append(line)
+            used += len(line) + 1
+        if not kept:
+            continue
+        if name != 'header':
+            parts.append(name.upper())
+        parts.extend(kept)
+
+    return '\n'.join(parts)
+
+def compact_text(text, token_budget=None):
+    """Section-split and compact plain text (TXT and DOC resumes); form feeds mark page breaks"""
+    if not text:
+        return text
+    pages = strip_page_furniture([page.splitlines() for page in text.split('\f')])
+    lines = [line for page in pages for line in page]
+    return compact_sections(split_sections(lines), token_budget)
@@ -0,0 +1,160 @@
+import os
+import sys
+import time
+import queue
+import pickle
+import select
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from ResumeParser.extractionWorker import HEADER
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+class ExtractionError(Exception):
+    """Raised when text extraction fails inside a worker"""
+    pass
+
+class ExtractionTimeout(ExtractionError):
+    """Raised when a worker exceeds the wall-clock limit; the worker is killed"""
+    pass
+
+class ExtractionCrashed(ExtractionError):
+    """Raised when a worker dies mid-job (segfault, memory limit, killed)"""
+    pass
+
+def get_extraction_settings():
+    """
+    EXTRACT_WORKERS: worker processes, defaults to the core count.
+    EXTRACT_TIMEOUT: wall-clock seconds per file before the worker is killed.
+    EXTRACT_MEMORY_LIMIT_MB: address-space cap per worker (0 disables).
+    EXTRACT_MAX_TASKS_PER_WORKER: files handled before a worker is replaced.
+    """
+    return {
+        'workers': max(1, int(os.getenv('EXTRACT_WORKERS', os.cpu_count() or 2))),
+        'timeout': float(os.getenv('EXTRACT_TIMEOUT', 30)),
+        'memory_limit_mb': int(os.getenv('EXTRACT_MEMORY_LIMIT_MB', 1024)),
+        'max_tasks_per_worker': max(1, int(os.getenv('EXTRACT_MAX_TASKS_PER_WORKER', 100)))
+    }
+
+class _Worker:
+    """One sandboxed extraction process, talking length-prefixed pickles over its pipes"""
+
+    def __init__(self, memory_limit_mb):
+        self.proc = subprocess.Popen(
+            [sys.executable, '-m', 'ResumeParser.extractionWorker', str(memory_limit_mb)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=BACKEND_DIR
+        )
+        self.tasks = 0
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def kill(self):
+        if self.alive():
+            self.proc.kill()
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _read_exact(self, size, deadline):
+        fd = self.proc.stdout.fileno()
+        data = b''
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ExtractionTimeout('Text extraction timed out')
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                raise ExtractionTimeout('Text extraction timed out')
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                raise ExtractionCrashed(f'Extraction worker exited with code {self.proc.poll()}')
+            data += chunk
+        return data
+
+    def call(self, func, args, timeout):
+        payload = pickle.dumps((func, args))
+        try:
+            self.proc.stdin.write(HEADER.pack(len(payload)) + payload)
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise ExtractionCrashed('Extraction worker is not running')
+        self.tasks += 1
+
+        deadline = time.monotonic() + timeout
+        size = HEADER.unpack(self._read_exact(HEADER.size, deadline))[0]
+        status, value = pickle.loads(self._read_exact(size, deadline))
+        if status != 'ok':
+            raise ExtractionError(value)
+        return value
+
+class ExtractionPool:
+    """
+    Pool of reusable, sandboxed extraction processes.
+    Each file gets a wall-clock limit; a worker that times out or dies is killed and
+    replaced on next use, and workers are recycled after max_tasks_per_worker files.
+    Workers are separate interpreters, so they never import the Flask app or models.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = settings or get_extraction_settings()
+        # None marks a free slot whose process has not been started (or was discarded)
+        self.idle = queue.Queue()
+        for _ in range(self.settings['workers']):
+            self.idle.put(None)
+        self.executor = ThreadPoolExecutor(max_workers=self.settings['workers'], thread_name_prefix='extract')
+
+    def run(self, func, *args, timeout=None):
+        """Run func(*args) in a worker and return its result; raises ExtractionError subclasses"""
+        worker = self.idle.get()
+        try:
+            if worker is not None and not worker.alive():
+                worker.kill()
+                worker = None
+            if worker is None:
+                worker = _Worker(self.settings['memory_limit_mb'])
+            return worker.call(func, args, timeout or self.settings['timeout'])
+        except (ExtractionTimeout, ExtractionCrashed):
+            # Never reuse a worker in an unknown state
+            worker.kill()
+            worker = None
+            raise
+        finally:
+            if worker is not None and worker.tasks >= self.settings['max_tasks_per_worker']:
+                worker.kill()
+                worker = None
+            self.idle.put(worker)
+
+    def submit(self, func, *args):
+        """run() on a background thread; returns a concurrent.futures.Future"""
+        return self.executor.submit(self.run, func, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        while not self.idle.empty():
+            worker = self.idle.get_nowait()
+            if worker is not None:
+                worker.kill()
+
+def get_extraction_pool():
+    """
+    Extraction pool shared by every request and bulk job in this process.
+    Jobs run in it must not use the pool themselves; callers fan work out from outside.
+    """
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ExtractionPool()
+            _pool_pid = os.getpid()
+        return _pool
@@ -0,0 +1,60 @@
+"""
+Worker process for ExtractionPool: reads length-prefixed pickled (func, args) requests
+on stdin and writes pickled ('ok', result) or ('error', message) responses back.
+Started as `python -m ResumeParser.extractionWorker <memory_limit_mb>`.
+"""
+import os
+import sys
+import pickle
+import struct
+
+HEADER = struct.Struct('>Q')
+
+def apply_memory_limit(memory_limit_mb):
+    """Cap the worker's address space so a pathological file fails this job instead of the host"""
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"Could not apply extraction memory limit: {e}", file=sys.stderr)
+
+def _read_exact(stream, size):
+    data = b''
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+def main():
+    # Keep the real stdout for responses; prints and C library output go to stderr
+    channel_out = os.fdopen(os.dup(1), 'wb')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    channel_in = sys.stdin.buffer
+
+    while True:
+        header = _read_exact(channel_in, HEADER.size)
+        if header is None:
+            return
+        payload = _read_exact(channel_in, HEADER.unpack(header)[0])
+        if payload is None:
+            return
+
+        try:
+            func, args = pickle.loads(payload)
+            response = ('ok', func(*args))
+        except BaseException as e:
+            response = ('error', f'{type(e).__name__}: {e}')
+
+        data = pickle.dumps(response)
+        channel_out.write(HEADER.pack(len(data)) + data)
+        channel_out.flush()
+
+if __name__ == '__main__':
+    apply_memory_limit(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+    main()
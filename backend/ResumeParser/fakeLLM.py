@@ -0,0 +1,67 @@
+import os
+import re
+import json
+import time
+import asyncio
+
+# Marker the resume prompt puts before the resume itself
+RESUME_MARKER = 'Resume text to parse:'
+
+FAKE_SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'node.js', 'flask', 'django',
+    'sql', 'postgresql', 'mongodb', 'docker', 'kubernetes', 'aws', 'git', 'c++',
+    'machine learning', 'communication', 'leadership', 'teamwork'
+]
+SOFT_SKILLS = {'communication', 'leadership', 'teamwork'}
+
+class FakeResponse:
+    """Mimics the `text` attribute of a Gemini response"""
+
+    def __init__(self, text):
+        self.text = text
+
+def get_fake_latency():
+    """Seconds each fake call takes (LLM_FAKE_LATENCY), to exercise concurrency offline"""
+    return float(os.getenv('LLM_FAKE_LATENCY', 0))
+
+def fake_parse(resume_text):
+    """Deterministic, regex-based stand-in for the model's answer to the resume prompt"""
+    lines = [line.strip() for line in resume_text.splitlines() if line.strip()]
+    lowered = resume_text.lower()
+
+    email = re.search(r'[\w\.\+-]+@[\w-]+\.[\w\.-]+', resume_text)
+    phone = re.search(r'\+?\d[\d\s\-()]{8,}\d', resume_text)
+    years = re.search(r'(\d{1,2})\+?\s*(?:years|yrs)', lowered)
+
+    return {
+        'candidate': {
+            'fullname': lines[0] if lines else None,
+            'email': email.group(0) if email else None,
+            'phone': re.sub(r'\D', '', phone.group(0)) if phone else None,
+            'location': None,
+            'years_experience': int(years.group(1)) if years else None,
+            'experience': ' '.join(lines[1:6]) if len(lines) > 1 else None
+        },
+        'education': [],
+        'skills': [{
+            'skill_name': skill,
+            'skill_category': 'soft' if skill in SOFT_SKILLS else 'technical',
+            'proficiency_level': 'intermediate'
+        } for skill in FAKE_SKILLS if re.search(r'(?<![\w+.])' + re.escape(skill) + r'(?![\w+])', lowered)]
+    }
+
+def _fake_response(contents):
+    prompt = contents if isinstance(contents, str) else str(contents)
+    resume_text = prompt.split(RESUME_MARKER, 1)[-1]
+    parsed = fake_parse(resume_text)
+    # The hybrid parser asks for skills it did not find itself under additional_skills
+    parsed['additional_skills'] = parsed['skills']
+    return FakeResponse(json.dumps(parsed))
+
+def fake_generate_content(contents):
+    time.sleep(get_fake_latency())
+    return _fake_response(contents)
+
+async def fake_generate_content_async(contents):
+    await asyncio.sleep(get_fake_latency())
+    return _fake_response(contents)
@@ -0,0 +1,88 @@
+import json
+
+CLOSERS = {'{': '}', '[': ']'}
+
+def _strip_trailing(out):
+    """Drop whitespace and a dangling comma before a closing bracket"""
+    while out and out[-1] in ' \t\r\n':
+        out.pop()
+    if out and out[-1] == ',':
+        out.pop()
+
+def _close(out, stack):
+    closed = list(out)
+    _strip_trailing(closed)
+    # A key or ':' with no value yet
+    if closed and closed[-1] == ':':
+        closed.append('null')
+    for closer in reversed(stack):
+        _strip_trailing(closed)
+        closed.append(closer)
+    return ''.join(closed)
+
+def repair_json(text):
+    """
+    Best-effort single-pass repair of almost-valid JSON from an LLM: markdown fences
+    and prose around the object, trailing commas, raw newlines inside strings and
+    output truncated mid-string or mid-object. Returns the decoded object or raises ValueError.
+    """
+    start = text.find('{')
+    if start == -1:
+        raise ValueError('No JSON object found in response')
+
+    out = []
+    stack = []
+    # (position, open brackets) after each comma, to fall back to the last complete member
+    checkpoints = []
+    in_string = False
+    escape = False
+
+    for ch in text[start:]:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch == '\n':
+                ch = '\\n'
+            out.append(ch)
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in CLOSERS:
+            stack.append(CLOSERS[ch])
+            out.append(ch)
+        elif ch in '}]':
+            if not stack or stack[-1] != ch:
+                # Stray closer, skip it
+                continue
+            _strip_trailing(out)
+            out.append(stack.pop())
+            if not stack:
+                # End of the top-level object; ignore anything after it
+                break
+        elif ch == ',':
+            checkpoints.append((len(out), list(stack)))
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+
+    candidate = _close(out, stack)
+    while True:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            if not checkpoints:
+                raise ValueError('Could not repair JSON response')
+            # Drop the incomplete last member and try again
+            position, stack = checkpoints.pop()
+            candidate = _close(out[:position], stack)
@@ -0,0 +1,218 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from dotenv import load_dotenv
+from google import genai
+from ResumeParser.fakeLLM import fake_generate_content, fake_generate_content_async
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_MODEL = os.getenv('LLM_MODEL', 'gemini-2.0-flash')
+# HTTP status codes worth retrying: rate limited or a transient provider failure
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+_limits = None
+_limits_lock = threading.Lock()
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+class TokenBucket:
+    """Blocking token bucket refilled continuously at capacity per minute"""
+
+    def __init__(self, capacity_per_minute):
+        self.capacity = float(capacity_per_minute)
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        """Take amount tokens if available and return 0, otherwise return seconds to wait"""
+        # A single request larger than the bucket would wait forever, so cap it
+        amount = min(float(amount), self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0
+            return (amount - self.tokens) / self.rate
+
+    def acquire(self, amount=1):
+        while True:
+            wait = self.reserve(amount)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, amount=1):
+        while True:
+            wait = self.reserve(amount)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+def get_gateway_settings():
+    """
+    LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE: provider quota to stay under.
+    LLM_MAX_IN_FLIGHT: concurrent requests per process.
+    LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY: backoff on 429s and 5xx.
+    """
+    return {
+        'requests_per_minute': max(1, int(os.getenv('LLM_REQUESTS_PER_MINUTE', 60))),
+        'tokens_per_minute': max(1, int(os.getenv('LLM_TOKENS_PER_MINUTE', 1000000))),
+        'max_in_flight': max(1, int(os.getenv('LLM_MAX_IN_FLIGHT', 8))),
+        'max_retries': max(0, int(os.getenv('LLM_MAX_RETRIES', 4))),
+        'retry_base_delay': float(os.getenv('LLM_RETRY_BASE_DELAY', 1.0)),
+        'retry_max_delay': float(os.getenv('LLM_RETRY_MAX_DELAY', 30.0))
+    }
+
+def use_fake_llm():
+    """LLM_FAKE=true answers every call locally, for offline development and tests"""
+    return os.getenv('LLM_FAKE', 'false').lower() == 'true'
+
+def get_client():
+    """
+    The process-wide Gemini client, created on first use.
+    Reusing it keeps HTTP connections alive across calls; a forked child builds its own.
+    """
+    global _client, _client_pid
+
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+            _client_pid = os.getpid()
+        return _client
+
+def get_event_loop():
+    """
+    The process-wide event loop, running on its own thread, that owns every async Gemini call.
+    The async client's HTTP session binds to the loop it first runs on, so requests from
+    other loops (asyncio.run, per-job loops) are handed to this one.
+    """
+    global _loop, _loop_pid
+
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='llm-gateway', daemon=True).start()
+            _loop_pid = os.getpid()
+        return _loop
+
+def _get_limits():
+    global _limits
+
+    with _limits_lock:
+        if _limits is None:
+            settings = get_gateway_settings()
+            _limits = {
+                'settings': settings,
+                'requests': TokenBucket(settings['requests_per_minute']),
+                'tokens': TokenBucket(settings['tokens_per_minute']),
+                'in_flight': threading.BoundedSemaphore(settings['max_in_flight'])
+            }
+        return _limits
+
+def estimate_tokens(text, expected_output_tokens=1024):
+    """Rough token count for rate limiting (about four characters per token)"""
+    return len(text or '') // 4 + expected_output_tokens
+
+def is_retryable(error):
+    """Rate limits, transient server errors and network failures are retried"""
+    code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (ConnectionError, TimeoutError)) or 'timeout' in type(error).__name__.lower()
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """Exponential backoff with full jitter, so concurrent callers do not retry in lockstep"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+def generate_content(contents, model=None, config=None):
+    """
+    Send one generate_content request through the gateway: waits for request and
+    token budget, holds an in-flight slot for the duration of the call and retries
+    retryable failures with jittered backoff. Returns the provider response.
+    """
+    limits = _get_limits()
+    settings = limits['settings']
+    token_estimate = estimate_tokens(contents if isinstance(contents, str) else str(contents))
+
+    attempt = 0
+    while True:
+        limits['requests'].acquire()
+        limits['tokens'].acquire(token_estimate)
+
+        try:
+            with limits['in_flight']:
+                if use_fake_llm():
+                    return fake_generate_content(contents)
+                return get_client().models.generate_content(
+                    model=model or DEFAULT_MODEL,
+                    contents=contents,
+                    config=config
+                )
+        except Exception as e:
+            if attempt >= settings['max_retries'] or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, settings['retry_base_delay'], settings['retry_max_delay'])
+            print(f"LLM call failed ({str(e)}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+async def generate_content_async(contents, model=None, config=None):
+    """
+    Async form of generate_content sharing the same budgets, in-flight cap and retries.
+    Waiting never blocks the event loop, so one thread can drive many requests.
+    Runs on the gateway loop (see get_event_loop) whichever loop awaits it.
+    """
+    loop = get_event_loop()
+    if asyncio.get_running_loop() is not loop:
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(_generate_content_async(contents, model, config), loop)
+        )
+    return await _generate_content_async(contents, model, config)
+
+async def _generate_content_async(contents, model, config):
+    limits = _get_limits()
+    settings = limits['settings']
+    token_estimate = estimate_tokens(contents if isinstance(contents, str) else str(contents))
+
+    attempt = 0
+    while True:
+        await limits['requests'].acquire_async()
+        await limits['tokens'].acquire_async(token_estimate)
+
+        # The in-flight cap is shared with threaded callers, so poll it rather than block
+        while not limits['in_flight'].acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        try:
+            if use_fake_llm():
+                return await fake_generate_content_async(contents)
+            return await get_client().aio.models.generate_content(
+                model=model or DEFAULT_MODEL,
+                contents=contents,
+                config=config
+            )
+        except Exception as e:
+            error = e
+        finally:
+            limits['in_flight'].release()
+
+        if attempt >= settings['max_retries'] or not is_retryable(error):
+            raise error
+        delay = backoff_delay(attempt, settings['retry_base_delay'], settings['retry_max_delay'])
+        print(f"LLM call failed ({str(error)}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        attempt += 1
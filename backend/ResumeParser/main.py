@@ -1,29 +1,78 @@
-from ResumeParser.readResume import readResume
-from ResumeParser.LLMParser import LLMParser
+import os
+from ResumeParser.readResume import readResumeSandboxed
+from ResumeParser.parseCache import hash_resume_bytes, get_cached_parse, store_parse
+from ResumeParser.extractionPool import ExtractionError
+from ResumeParser.LLMParser import LLMParser, LLMParserAsync
 from ResumeParser.validateResult import validate_and_clean_data
 
 def resumeParser(file_path):
     """
     Main function to parse a resume file and extract structured data
     """
-    # Read the resume file and extract text
-    resume_text = readResume(file_path)
+    if not os.path.exists(file_path):
+        print(f"File not found: {file_path}")
+        return parseResumeText(None)
     
-    if not resume_text:
-        return {
-            'error': 'Could not extract text from resume file',
-            'candidate': None,
-            'education': [],
-            'skills': []
-        }
+    with open(file_path, 'rb') as f:
+        file_bytes = f.read()
     
-    # Use LLMParser to extract structured data
-    parsed_data = LLMParser(resume_text)
+    return resumeParserBytes(file_bytes, os.path.basename(file_path))
+
+def resumeParserBytes(file_bytes, filename):
+    """
+    Parse a resume held in memory; the filename is only used to detect the format.
+    Identical files are served from the content-hash cache without extraction or LLM calls.
+    """
+    content_hash = hash_resume_bytes(file_bytes)
+    cached = get_cached_parse(content_hash)
+    if cached and cached['parsed_data'] is not None:
+        return cached['parsed_data']
     
+    # Extract text straight from the bytes in a sandboxed worker, so a malformed file
+    # can only time out or crash that worker, never the request thread
+    if cached:
+        resume_text = cached['resume_text']
+    else:
+        try:
+            resume_text = readResumeSandboxed(file_bytes, filename)
+        except ExtractionError as e:
+            print(f"Error extracting text: {e}")
+            resume_text = None
+    
+    parsed_data = parseResumeText(resume_text)
+    store_parse(content_hash, resume_text, parsed_data)
+    return parsed_data
+
+def _empty_text_result():
+    return {
+        'error': 'Could not extract text from resume file',
+        'candidate': None,
+        'education': [],
+        'skills': []
+    }
+
+def _validate(parsed_data):
     # Validate and clean the parsed data
     validated_data = validate_and_clean_data(parsed_data)
-    # print(f"Parsed Data: {parsed_data}")
-    # print(f"Validated Data: {validated_data}")
     
     # Return validated data instead of raw parsed data
-    return validated_data if not validated_data.get('error') else parsed_data
\ No newline at end of file
+    return validated_data if not validated_data.get('error') else parsed_data
+
+def parseResumeText(resume_text):
+    """
+    Extract structured data from already extracted resume text
+    """
+    if not resume_text:
+        return _empty_text_result()
+    
+    # Use LLMParser to extract structured data
+    return _validate(LLMParser(resume_text))
+
+async def parseResumeTextAsync(resume_text):
+    """
+    Async form of parseResumeText, so many resumes can be parsed from one event loop
+    """
+    if not resume_text:
+        return _empty_text_result()
+    
+    return _validate(await LLMParserAsync(resume_text))
@@ -0,0 +1,158 @@
+import os
+import json
+import hashlib
+import itertools
+import sqlite3
+import threading
+import time
+from ResumeParser.llmGateway import DEFAULT_MODEL, use_fake_llm
+from ResumeParser.LLMParser import use_hybrid_parser
+from ResumeParser.documentSections import get_token_budget
+from ResumeParser.readResume import get_extraction_limits
+
+# Bump whenever text extraction, the LLM prompt or validation changes,
+# so results produced by the old parser are no longer served
+PARSER_VERSION = 'v7'
+
+# Evict on the first and then every Nth store in this process instead of on every store
+EVICT_EVERY = 64
+
+_local = threading.local()
+_stores = itertools.count()
+
+def get_cache_db_path():
+    """SQLite file holding cached parses, shared by every worker process on the host"""
+    return os.getenv('PARSE_CACHE_DB_PATH') or os.path.join(os.getcwd(), 'Uploads', 'parse_cache.sqlite3')
+
+def get_cache_max_bytes():
+    """Upper bound on cached text + results (PARSE_CACHE_MAX_BYTES, 0 disables the cache)"""
+    return int(os.getenv('PARSE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+def _connect():
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        return conn
+
+    db_path = get_cache_db_path()
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS parse_cache (
+            content_hash TEXT NOT NULL,
+            parser_version TEXT NOT NULL,
+            resume_text TEXT,
+            parsed_data TEXT,
+            size INTEGER NOT NULL,
+            last_used_at REAL NOT NULL,
+            PRIMARY KEY (content_hash, parser_version)
+        );
+        CREATE INDEX IF NOT EXISTS ix_parse_cache_last_used ON parse_cache (last_used_at);
+    ''')
+    _local.conn = conn
+    return conn
+
+def get_cache_version():
+    """
+    PARSER_VERSION plus a fingerprint of the settings that change the cached text or result
+    (fake LLM, hybrid parser, model, token budget, extraction limits), so a parse produced
+    under one configuration is never served to another
+    """
+    limits = get_extraction_limits()
+    settings = [
+        'fake' if use_fake_llm() else DEFAULT_MODEL,
+        'hybrid' if use_hybrid_parser() else 'llm',
+        get_token_budget(),
+        limits['max_pages'],
+        limits['max_chars']
+    ]
+    fingerprint = hashlib.sha256(json.dumps(settings).encode('utf-8')).hexdigest()[:12]
+    return f'{PARSER_VERSION}:{fingerprint}'
+
+def hash_resume_bytes(file_bytes):
+    """Content address of a resume file"""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+def get_cached_parse(content_hash):
+    """
+    Cached entry for a resume, or None.
+    Returns a dict with resume_text and parsed_data; parsed_data is None when only
+    the extracted text is known (the LLM call failed last time).
+    """
+    if get_cache_max_bytes() <= 0:
+        return None
+
+    try:
+        cache_version = get_cache_version()
+        conn = _connect()
+        row = conn.execute(
+            'SELECT resume_text, parsed_data FROM parse_cache WHERE content_hash = ? AND parser_version = ?',
+            (content_hash, cache_version)
+        ).fetchone()
+        if not row:
+            return None
+
+        conn.execute(
+            'UPDATE parse_cache SET last_used_at = ? WHERE content_hash = ? AND parser_version = ?',
+            (time.time(), content_hash, cache_version)
+        )
+        return {
+            'resume_text': row['resume_text'],
+            'parsed_data': json.loads(row['parsed_data']) if row['parsed_data'] else None
+        }
+    except Exception as e:
+        # The cache is an optimisation only; fall back to parsing
+        print(f"Error reading parse cache: {str(e)}")
+        return None
+
+def store_parse(content_hash, resume_text, parsed_data=None):
+    """
+    Cache the extracted text and, if it parsed cleanly, the validated result.
+    Results with an error are never cached so a transient LLM failure is retried.
+    """
+    max_bytes = get_cache_max_bytes()
+    if max_bytes <= 0 or not resume_text:
+        return
+
+    if parsed_data is not None and parsed_data.get('error'):
+        parsed_data = None
+    parsed_json = json.dumps(parsed_data) if parsed_data is not None else None
+    size = len(resume_text.encode('utf-8')) + len(parsed_json or '')
+
+    try:
+        conn = _connect()
+        conn.execute(
+            'INSERT INTO parse_cache (content_hash, parser_version, resume_text, parsed_data, size, last_used_at) '
+            'VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (content_hash, parser_version) DO UPDATE SET resume_text = excluded.resume_text, '
+            'parsed_data = COALESCE(excluded.parsed_data, parse_cache.parsed_data), '
+            'size = excluded.size, last_used_at = excluded.last_used_at',
+            (content_hash, get_cache_version(), resume_text, parsed_json, size, time.time())
+        )
+        if next(_stores) % EVICT_EVERY == 0:
+            _evict(conn, max_bytes)
+    except Exception as e:
+        print(f"Error writing parse cache: {str(e)}")
+
+def _evict(conn, max_bytes):
+    """
+    Drop entries from older parser versions, then least recently used entries until under
+    the size bound. Entries for other settings of this version age out through the LRU.
+    Only runs every EVICT_EVERY stores, so the cache may briefly exceed the bound by that many entries.
+    """
+    conn.execute("DELETE FROM parse_cache WHERE parser_version NOT LIKE ? || ':%'", (PARSER_VERSION,))
+
+    total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM parse_cache').fetchone()[0]
+    if total <= max_bytes:
+        return
+
+    to_delete = []
+    for row in conn.execute('SELECT content_hash, parser_version, size FROM parse_cache ORDER BY last_used_at'):
+        to_delete.append((row['content_hash'], row['parser_version']))
+        total -= row['size']
+        if total <= max_bytes:
+            break
+
+    conn.executemany('DELETE FROM parse_cache WHERE content_hash = ? AND parser_version = ?', to_delete)
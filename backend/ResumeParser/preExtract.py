@@ -0,0 +1,225 @@
+import re
+from datetime import datetime
+from ResumeParser.documentSections import split_sections
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERN = re.compile(r'(?<!\d)\+?\d[\d\s\-().]{8,18}\d(?!\d)')
+URL_PATTERN = re.compile(r'(https?://\S+|www\.\S+|(linkedin|github)\.com/\S+)', re.IGNORECASE)
+YEARS_PATTERN = re.compile(r'(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years|yrs)\b', re.IGNORECASE)
+
+MONTHS = r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+MONTH_NUMBERS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1
+)}
+# Captures (start month, start year, end month, end year, ongoing); months are optional
+DATE_RANGE_PATTERN = re.compile(
+    r'(?:' + MONTHS + r'\s*)?((?:19|20)\d{2})\s*(?:-|–|—|to)\s*'
+    r'(?:(?:' + MONTHS + r'\s*)?((?:19|20)\d{2})|(present|current|now|date))',
+    re.IGNORECASE
+)
+# Lines with these words outside the experience section describe studies, not work
+EDUCATION_WORDS = re.compile(
+    r'\b(university|college|school|institute|bachelor|master|b\.?tech|m\.?tech|b\.?e|b\.?sc|m\.?sc|degree|phd|cgpa|gpa)\b',
+    re.IGNORECASE
+)
+# Sections whose dates and durations describe studies or side work, not employment
+NON_WORK_SECTIONS = {'education', 'projects', 'certifications', 'achievements', 'publications'}
+# Short labels left on a line once its contact details or skills are removed
+LABEL_WORDS = re.compile(
+    r'\b(email|e-mail|mail|phone|mobile|tel|contact|linkedin|github|skills?|technical|tools|'
+    r'technologies|languages|frameworks|databases|soft)\b',
+    re.IGNORECASE
+)
+
+# Skills recognised locally; the pattern is matched case-insensitively on word boundaries.
+# Ambiguous short names (go, r, c) are left to the LLM.
+SKILL_DICTIONARY = [
+    ('Python', 'technical', r'python'),
+    ('Java', 'technical', r'java(?!\s*script)'),
+    ('JavaScript', 'technical', r'javascript|js'),
+    ('TypeScript', 'technical', r'typescript'),
+    ('C++', 'technical', r'c\+\+'),
+    ('C#', 'technical', r'c#'),
+    ('React', 'technical', r'react(?:\.?js)?(?!\s*native)'),
+    ('React Native', 'technical', r'react\s*native'),
+    ('Angular', 'technical', r'angular(?:js)?'),
+    ('Vue.js', 'technical', r'vue(?:\.?js)?'),
+    ('Node.js', 'technical', r'node(?:\.?js)'),
+    ('Express', 'technical', r'express(?:\.?js)'),
+    ('Next.js', 'technical', r'next\.?js'),
+    ('Flask', 'technical', r'flask'),
+    ('Django', 'technical', r'django'),
+    ('Spring Boot', 'technical', r'spring\s*boot'),
+    ('HTML', 'technical', r'html5?'),
+    ('CSS', 'technical', r'css3?'),
+    ('Tailwind CSS', 'technical', r'tailwind(?:\s*css)?'),
+    ('SQL', 'technical', r'sql'),
+    ('PostgreSQL', 'technical', r'postgres(?:ql)?'),
+    ('MySQL', 'technical', r'mysql'),
+    ('MongoDB', 'technical', r'mongo(?:db)?'),
+    ('Redis', 'technical', r'redis'),
+    ('Docker', 'technical', r'docker'),
+    ('Kubernetes', 'technical', r'kubernetes|k8s'),
+    ('AWS', 'technical', r'aws|amazon\s*web\s*services'),
+    ('Google Cloud', 'technical', r'gcp|google\s*cloud'),
+    ('Microsoft Azure', 'technical', r'azure'),
+    ('Git', 'technical', r'git(?!hub|lab)'),
+    ('Linux', 'technical', r'linux'),
+    ('REST API', 'technical', r'rest(?:ful)?\s*apis?'),
+    ('GraphQL', 'technical', r'graphql'),
+    ('Machine Learning', 'technical', r'machine\s*learning'),
+    ('Deep Learning', 'technical', r'deep\s*learning'),
+    ('Natural Language Processing', 'technical', r'natural\s*language\s*processing|nlp'),
+    ('Computer Vision', 'technical', r'computer\s*vision'),
+    ('TensorFlow', 'technical', r'tensorflow'),
+    ('PyTorch', 'technical', r'pytorch'),
+    ('Scikit-learn', 'technical', r'scikit[\s-]*learn|sklearn'),
+    ('Pandas', 'technical', r'pandas'),
+    ('NumPy', 'technical', r'numpy'),
+    ('Power BI', 'technical', r'power\s*bi'),
+    ('Tableau', 'technical', r'tableau'),
+    ('Excel', 'technical', r'(?:ms\s*)?excel'),
+    ('Figma', 'technical', r'figma'),
+    ('Communication', 'soft', r'communication'),
+    ('Leadership', 'soft', r'leadership'),
+    ('Teamwork', 'soft', r'teamwork|team\s*player'),
+    ('Problem Solving', 'soft', r'problem[\s-]*solving'),
+    ('Time Management', 'soft', r'time\s*management'),
+    ('English', 'language', r'english'),
+    ('Hindi', 'language', r'hindi'),
+]
+_SKILL_PATTERNS = [
+    (name, category, re.compile(r'(?<![\w+#.])(?:' + pattern + r')(?![\w+#])', re.IGNORECASE))
+    for name, category, pattern in SKILL_DICTIONARY
+]
+
+def extract_email(text):
+    match = EMAIL_PATTERN.search(text)
+    return match.group(0).lower() if match else None
+
+def _phone_digits(candidate):
+    """Digits of a phone-like match if it has 10 to 15 of them (same rule as clean_phone), else None"""
+    digits = re.sub(r'\D', '', candidate)
+    return digits if 10 <= len(digits) <= 15 else None
+
+def extract_phone(text):
+    """First phone-like number with 10 to 15 digits, digits only"""
+    for match in PHONE_PATTERN.finditer(text):
+        digits = _phone_digits(match.group(0))
+        if digits:
+            return digits
+    return None
+
+def _work_lines(sections, names=None):
+    """
+    Lines outside education and project sections (or only in the named sections).
+    Outside the experience section, lines mentioning studies are dropped too; inside it they
+    are kept, since roles such as "Research Assistant, XYZ University" are work.
+    """
+    return [
+        line for section in sections
+        if (section['name'] in names if names else section['name'] not in NON_WORK_SECTIONS)
+        for line in section['lines']
+        if section['name'] == 'experience' or not EDUCATION_WORDS.search(line)
+    ]
+
+def _month_index(year, month):
+    return int(year) * 12 + MONTH_NUMBERS[month[:3].lower()] - 1
+
+def _date_range_months(match, today):
+    """
+    Half-open [start, end) month indexes of a date range. A named end month counts in
+    full; a bare start year begins in January and a bare end year ends as it begins.
+    """
+    start_month, start_year, end_month, end_year, ongoing = match
+    start = _month_index(start_year, start_month or 'jan')
+    if ongoing:
+        end = today.year * 12 + today.month
+    elif end_month:
+        end = _month_index(end_year, end_month) + 1
+    else:
+        end = _month_index(end_year, 'jan')
+    return start, end
+
+def estimate_years_experience(text, today=None):
+    """
+    Years of experience from an explicit statement ("5+ years") outside education and
+    project sections, otherwise from the merged month ranges of the experience section.
+    None when the estimate is not confident: no experience heading (dates cannot be told
+    apart from study periods), no usable ranges, or less than a year in total, such as
+    an internship-only resume. The LLM estimates those.
+    """
+    sections = split_sections(text.splitlines())
+    
+    stated = [float(value) for line in _work_lines(sections) for value in YEARS_PATTERN.findall(line)]
+    stated = [value for value in stated if 0 < value <= 50]
+    if stated:
+        return int(max(stated))
+
+    today = today or datetime.now()
+    current = today.year * 12 + today.month
+    intervals = []
+    for line in _work_lines(sections, {'experience'}):
+        for match in DATE_RANGE_PATTERN.findall(line):
+            start, end = _date_range_months(match, today)
+            if start < end <= current:
+                intervals.append((start, end))
+
+    if not intervals:
+        return None
+
+    # Merge overlapping roles so concurrent positions are not double counted
+    intervals.sort()
+    total = 0
+    merged_start, merged_end = intervals[0]
+    for start, end in intervals[1:]:
+        if start <= merged_end:
+            merged_end = max(merged_end, end)
+        else:
+            total += merged_end - merged_start
+            merged_start, merged_end = start, end
+    total += merged_end - merged_start
+
+    years = min(total // 12, 50)
+    return years or None
+
+def match_dictionary_skills(text):
+    """Skills from SKILL_DICTIONARY mentioned in the text, in dictionary order"""
+    return [
+        {'skill_name': name, 'skill_category': category}
+        for name, category, pattern in _SKILL_PATTERNS if pattern.search(text)
+    ]
+
+def _is_consumed(line, phone=None):
+    """
+    True when nothing needing interpretation is left on the line.
+    Only the extracted phone number is removed, so dates such as "2019 - 2023" survive.
+    """
+    remainder = URL_PATTERN.sub(' ', line)
+    remainder = EMAIL_PATTERN.sub(' ', remainder)
+    if phone:
+        remainder = PHONE_PATTERN.sub(
+            lambda match: ' ' if _phone_digits(match.group(0)) == phone else match.group(0), remainder
+        )
+    for _, _, pattern in _SKILL_PATTERNS:
+        remainder = pattern.sub(' ', remainder)
+    remainder = LABEL_WORDS.sub(' ', remainder)
+    return len(re.sub(r'[\W_]+', '', remainder)) < 3
+
+def pre_extract(resume_text):
+    """
+    Deterministic first pass over a resume: email, phone, years of experience and
+    dictionary-matched skills, plus the text left for the LLM with contact-only and
+    skill-list-only lines removed
+    """
+    phone = extract_phone(resume_text)
+    lines = resume_text.splitlines()
+    remaining_lines = [line for line in lines if line.strip() and not _is_consumed(line, phone)]
+
+    return {
+        'email': extract_email(resume_text),
+        'phone': phone,
+        'years_experience': estimate_years_experience(resume_text),
+        'skills': match_dictionary_skills(resume_text),
+        'remaining_text': '\n'.join(remaining_lines)
+    }
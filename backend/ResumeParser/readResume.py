@@ -1,9 +1,40 @@
 import os
+import io
+import tempfile
 import fitz  # PyMuPDF for PDF
 from docx import Document  # python-docx for DOCX
 import zipfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
+from ResumeParser.documentSections import split_sections, compact_sections, compact_text, get_token_budget, strip_page_furniture
+from ResumeParser.extractionPool import get_extraction_pool, ExtractionError
+
+# PyMuPDF span flag for bold text
+BOLD_FLAG = 2 ** 4
+
+def get_extraction_limits():
+    """
+    EXTRACT_MAX_PAGES: PDF pages read before extraction stops.
+    EXTRACT_MAX_CHARS: raw characters collected before extraction stops; defaults to
+    three times the prompt budget, since compaction keeps far less than that.
+    """
+    return {
+        'max_pages': max(1, int(os.getenv('EXTRACT_MAX_PAGES', 50))),
+        'max_chars': max(1, int(os.getenv('EXTRACT_MAX_CHARS', get_token_budget() * 4 * 3)))
+    }
+
+def get_pdf_parallel_settings():
+    """
+    PDF_PARALLEL_MIN_PAGES: PDFs with more pages than this are split into page ranges
+    extracted in parallel; shorter ones (ordinary resumes) stay in a single process.
+    PDF_PAGES_PER_RANGE: pages per range.
+    PDF_PARALLEL_WORKERS: page ranges of one document in flight at once.
+    """
+    return {
+        'min_pages': max(1, int(os.getenv('PDF_PARALLEL_MIN_PAGES', 8))),
+        'pages_per_range': max(1, int(os.getenv('PDF_PAGES_PER_RANGE', 4))),
+        'workers': max(1, int(os.getenv('PDF_PARALLEL_WORKERS', 4)))
+    }
 
 def readResume(file_path):
     """
@@ -24,9 +55,9 @@ def readResume(file_path):
         elif file_extension == '.docx':
             return extract_text_from_docx(file_path)
         elif file_extension == '.doc':
-            return extract_text_from_doc(file_path)
+            return compact_text(_limit_text(extract_text_from_doc(file_path)))
         elif file_extension == '.txt':
-            return extract_text_from_txt(file_path)
+            return compact_text(_limit_text(extract_text_from_txt(file_path)))
         else:
             print(f"Unsupported file format: {file_extension}")
             return None
@@ -35,41 +66,238 @@ def readResume(file_path):
         print(f"Error reading file {file_path}: {e}")
         return None
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF using PyMuPDF"""
+def readResumeStream(stream, filename):
+    """
+    Extract text from a binary file-like object, e.g. a Flask upload, without saving it first
+    Supports: PDF, DOCX, DOC, TXT
+    """
+    file_extension = Path(filename).suffix.lower()
+    
+    # python-docx reads seekable streams directly; the other formats need the bytes
+    if file_extension == '.docx' and stream.seekable():
+        try:
+            return extract_text_from_docx(stream)
+        except Exception as e:
+            print(f"Error reading file {filename}: {e}")
+            return None
+    
+    return readResumeBytes(stream.read(), filename)
+
+def readResumeBytes(file_bytes, filename):
+    """
+    Extract text from an in-memory resume, e.g. a ZIP member, without writing it to disk
+    Supports: PDF, DOCX, DOC, TXT
+    """
+    file_extension = Path(filename).suffix.lower()
+    
     try:
-        doc = fitz.open(file_path)
-        text = ""
-        
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text += page.get_text()
+        if file_extension == '.pdf':
+            return extract_text_from_pdf(stream=file_bytes)
+        elif file_extension == '.docx':
+            return extract_text_from_docx(io.BytesIO(file_bytes))
+        elif file_extension == '.doc':
+            return compact_text(_limit_text(extract_text_from_doc_bytes(file_bytes)))
+        elif file_extension == '.txt':
+            return compact_text(_limit_text(decode_text_bytes(file_bytes)))
+        else:
+            print(f"Unsupported file format: {file_extension}")
+            return None
             
+    except Exception as e:
+        print(f"Error reading file {filename}: {e}")
+        return None
+
+def extract_pdf_page_lines(page):
+    """
+    Text lines of one PDF page from PyMuPDF layout blocks, in reading order,
+    as (text, emphasised) where emphasised marks bold or larger-than-body lines
+    """
+    lines = []
+    for block in page.get_text('dict')['blocks']:
+        # Image blocks have no lines
+        for line in block.get('lines', []):
+            spans = [span for span in line['spans'] if span['text'].strip()]
+            if not spans:
+                continue
+            text = ''.join(span['text'] for span in spans)
+            size = max(span['size'] for span in spans)
+            bold = all(span['flags'] & BOLD_FLAG for span in spans)
+            lines.append((text, size, bold))
+    return lines
+
+def _mark_emphasis(lines):
+    """Lines in a font noticeably larger than the most common size, or bold, are candidate headings"""
+    if not lines:
+        return []
+    sizes = [round(size) for _, size, _ in lines]
+    body_size = max(set(sizes), key=sizes.count)
+    return [(text, bold or size >= body_size * 1.15) for text, size, bold in lines]
+
+def _limit_text(text):
+    """Drop text past EXTRACT_MAX_CHARS before it is split into sections"""
+    return text[:get_extraction_limits()['max_chars']] if text else text
+
+def extract_pdf_range_lines(pdf_bytes, start, end):
+    """Lines of pages [start, end) of a PDF held in memory, one list per page; runs in a worker"""
+    doc = fitz.open(stream=pdf_bytes, filetype='pdf')
+    try:
+        return [extract_pdf_page_lines(doc[page_number]) for page_number in range(start, end)]
+    finally:
         doc.close()
-        return text.strip()
+
+def _take_pages(pages, max_chars):
+    """Pages up to and including the one that reaches max_chars"""
+    taken = []
+    chars = 0
+    for page_lines in pages:
+        if chars >= max_chars:
+            break
+        taken.append(page_lines)
+        chars += sum(len(text) + 1 for text, _, _ in page_lines)
+    return taken
+
+def sections_from_pdf_pages(pages):
+    """Sections from per-page PDF lines: running headers/footers removed, pages joined once"""
+    lines = [line for page_lines in strip_page_furniture(pages) for line in page_lines]
+    return split_sections(_mark_emphasis(lines))
+
+def _read_pdf_sections(doc, page_count, max_chars):
+    # Generator, so pages past the character limit are never extracted
+    pages = (extract_pdf_page_lines(doc[page_number]) for page_number in range(page_count))
+    return sections_from_pdf_pages(_take_pages(pages, max_chars))
+
+def extract_sections_from_pdf(file_path=None, stream=None):
+    """
+    Sections of a PDF resume, split on headings detected from the layout.
+    Stops early after EXTRACT_MAX_PAGES pages or EXTRACT_MAX_CHARS characters.
+    """
+    limits = get_extraction_limits()
+    doc = fitz.open(stream=stream, filetype='pdf') if stream is not None else fitz.open(file_path)
+    try:
+        return _read_pdf_sections(doc, min(doc.page_count, limits['max_pages']), limits['max_chars'])
+    finally:
+        doc.close()
+
+def extract_pdf_text_or_page_count(pdf_bytes):
+    """
+    Runs in a worker: ('text', text) for PDFs of up to PDF_PARALLEL_MIN_PAGES pages, read
+    in this one job, or ('split', page_count) when the caller should fan out page ranges
+    """
+    limits = get_extraction_limits()
+    try:
+        doc = fitz.open(stream=pdf_bytes, filetype='pdf')
+        try:
+            page_count = min(doc.page_count, limits['max_pages'])
+            if page_count > get_pdf_parallel_settings()['min_pages']:
+                return 'split', page_count
+            return 'text', compact_sections(_read_pdf_sections(doc, page_count, limits['max_chars']))
+        finally:
+            doc.close()
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}")
+        return 'text', None
+
+def _extract_pdf_pages_parallel(pool, pdf_bytes, page_count, settings, max_chars):
+    """
+    Lines of each page, with page ranges extracted as separate pool jobs and kept in order.
+    Ranges go out PDF_PARALLEL_WORKERS at a time and dispatch stops once max_chars is reached,
+    so a long document does no more work than the sequential path.
+    """
+    step = settings['pages_per_range']
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    pages = []
+    chars = 0
+    for wave_start in range(0, len(ranges), settings['workers']):
+        futures = [
+            pool.submit(extract_pdf_range_lines, pdf_bytes, start, end)
+            for start, end in ranges[wave_start:wave_start + settings['workers']]
+        ]
+        for future in futures:
+            range_pages = future.result()
+            pages.extend(range_pages)
+            chars += sum(len(text) + 1 for page_lines in range_pages for text, _, _ in page_lines)
+        if chars >= max_chars:
+            break
+    return _take_pages(pages, max_chars)
+
+def readResumeSandboxed(file_bytes, filename):
+    """
+    Extract text from an in-memory resume in the sandboxed extraction pool.
+    Runs in the calling process and only dispatches jobs; PDFs longer than
+    PDF_PARALLEL_MIN_PAGES are split into page ranges extracted as parallel jobs
+    and assembled here. Never call it from inside a pool job.
+    Raises ExtractionError when a job times out, crashes or fails.
+    """
+    pool = get_extraction_pool()
+    if Path(filename).suffix.lower() != '.pdf':
+        return pool.run(readResumeBytes, file_bytes, filename)
+
+    # Ordinary resumes are read in this single job, exactly like other formats
+    kind, value = pool.run(extract_pdf_text_or_page_count, file_bytes)
+    if kind == 'text':
+        return value
+
+    try:
+        pages = _extract_pdf_pages_parallel(
+            pool, file_bytes, value, get_pdf_parallel_settings(), get_extraction_limits()['max_chars']
+        )
+    except ExtractionError as e:
+        print(f"Parallel PDF extraction failed, reading {filename} in one job: {e}")
+        return pool.run(readResumeBytes, file_bytes, filename)
+    return compact_sections(sections_from_pdf_pages(pages))
+
+def extract_text_from_pdf(file_path=None, stream=None):
+    """Extract section-aware, budgeted text from PDF using PyMuPDF, from a path or from bytes"""
+    try:
+        return compact_sections(extract_sections_from_pdf(file_path, stream))
         
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return None
 
+def extract_sections_from_docx(file_path):
+    """
+    Sections of a DOCX resume, split on heading styles and heading-like paragraphs.
+    Stops early once EXTRACT_MAX_CHARS characters have been collected.
+    """
+    max_chars = get_extraction_limits()['max_chars']
+    doc = Document(file_path)
+    lines = []
+    chars = 0
+    
+    # Extract text from paragraphs
+    for paragraph in doc.paragraphs:
+        if chars >= max_chars:
+            break
+        if not paragraph.text.strip():
+            continue
+        style_name = (paragraph.style.name if paragraph.style is not None else '') or ''
+        runs = [run for run in paragraph.runs if run.text.strip()]
+        bold = bool(runs) and all(run.bold for run in runs)
+        emphasised = style_name.startswith('Heading') or style_name == 'Title' or bold
+        lines.append((paragraph.text, emphasised))
+        chars += len(paragraph.text) + 1
+    
+    # Extract text from tables
+    for table in doc.tables:
+        for row in table.rows:
+            if chars >= max_chars:
+                break
+            # Merged cells repeat the same cell object across the row
+            cells = []
+            for cell in row.cells:
+                if cell.text.strip() and cell.text not in cells:
+                    cells.append(cell.text)
+            if cells:
+                lines.append((" ".join(cells), False))
+                chars += sum(len(cell) + 1 for cell in cells)
+    
+    return split_sections(lines)
+
 def extract_text_from_docx(file_path):
-    """Extract text from DOCX using python-docx"""
+    """Extract section-aware, budgeted text from DOCX using python-docx (accepts a path or a file-like object)"""
     try:
-        doc = Document(file_path)
-        text = ""
-        
-        # Extract text from paragraphs
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-            
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + " "
-                text += "\n"
-                
-        return text.strip()
+        return compact_sections(extract_sections_from_docx(file_path))
         
     except Exception as e:
         print(f"Error extracting text from DOCX: {e}")
@@ -99,12 +327,16 @@ def extract_text_from_doc_alternative(file_path):
     try:
         import subprocess
         result = subprocess.run(['antiword', file_path], 
-                              capture_output=True, text=True)
+                              capture_output=True, text=True,
+                              timeout=float(os.getenv('EXTRACT_TIMEOUT', 30)))
         if result.returncode == 0:
             return result.stdout.strip()
         else:
             print("Could not extract text from DOC file. Consider converting to DOCX.")
             return None
+    except subprocess.TimeoutExpired:
+        print("antiword timed out on DOC file. Consider converting to DOCX.")
+        return None
     except FileNotFoundError:
         print("antiword not found. For better DOC support, install antiword or convert to DOCX.")
         return None
@@ -112,26 +344,67 @@ def extract_text_from_doc_alternative(file_path):
         print(f"Error with antiword: {e}")
         return None
 
+def extract_text_from_doc_bytes(file_bytes):
+    """
+    DOC extraction tools only read from disk, so legacy .doc files
+    go through a temporary file that is removed afterwards
+    """
+    with tempfile.NamedTemporaryFile(suffix='.doc', delete=False) as temp_file:
+        temp_file.write(file_bytes)
+        temp_path = temp_file.name
+    try:
+        return extract_text_from_doc(temp_path)
+    finally:
+        os.remove(temp_path)
+
+# Byte order marks and the encodings they identify, longest first
+BOMS = [
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16')
+]
+
+def detect_text_encoding(file_bytes):
+    """
+    Encoding of a text resume: a byte order mark, then strict UTF-8, then
+    charset_normalizer's guess if it is installed, then cp1252
+    """
+    for bom, encoding in BOMS:
+        if file_bytes.startswith(bom):
+            return encoding
+    
+    try:
+        file_bytes.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(file_bytes).best()
+        if best is not None:
+            return best.encoding
+    except ImportError:
+        pass
+    
+    return 'cp1252'
+
+def decode_text_bytes(file_bytes):
+    """Decode TXT bytes using the detected encoding; latin-1 is the last resort as it never fails"""
+    for encoding in [detect_text_encoding(file_bytes), 'latin-1']:
+        try:
+            return file_bytes.decode(encoding).strip()
+        except (UnicodeDecodeError, LookupError):
+            continue
+    
+    print(f"Could not decode text file with any encoding")
+    return None
+
 def extract_text_from_txt(file_path):
     """Extract text from TXT files"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        return content.strip()
-        
-    except UnicodeDecodeError:
-        # Try different encodings
-        encodings = ['latin-1', 'cp1252', 'iso-8859-1']
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
-                return content.strip()
-            except UnicodeDecodeError:
-                continue
-        
-        print(f"Could not decode text file with any encoding")
-        return None
+        with open(file_path, 'rb') as file:
+            return decode_text_bytes(file.read())
         
     except Exception as e:
         print(f"Error reading text file: {e}")
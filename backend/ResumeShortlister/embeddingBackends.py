@@ -0,0 +1,111 @@
+import os
+import numpy as np
+
+# Sentence length used by all-MiniLM-L6-v2
+MAX_SEQ_LENGTH = 256
+
+def _normalize(embeddings):
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.clip(norms, 1e-12, None)
+
+class TorchEmbeddingBackend:
+    """SentenceTransformer running on PyTorch (the original path)"""
+    name = 'torch'
+
+    def __init__(self, model_path):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_path)
+
+    def encode(self, texts, batch_size=256, normalize_embeddings=True):
+        embeddings = self.model.encode(texts, batch_size=batch_size, normalize_embeddings=normalize_embeddings)
+        return np.asarray(embeddings, dtype=np.float32)
+
+class OnnxEmbeddingBackend:
+    """int8-quantized export of the same model running on ONNX Runtime (CPU)"""
+    name = 'onnx'
+
+    def __init__(self, onnx_dir):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_file = os.path.join(onnx_dir, 'model_int8.onnx')
+        if not os.path.exists(model_file):
+            raise FileNotFoundError(
+                f"ONNX model not found at {model_file}. Run 'flask export-onnx-model' first."
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_file, options, providers=['CPUExecutionProvider'])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+
+    def encode(self, texts, batch_size=256, normalize_embeddings=True):
+        if isinstance(texts, str):
+            texts = [texts]
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=MAX_SEQ_LENGTH,
+                return_tensors='np'
+            )
+            inputs = {name: encoded[name].astype(np.int64) for name in encoded if name in self.input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+
+            # Mean pooling over real tokens, same as the SentenceTransformer pooling layer
+            mask = encoded['attention_mask'][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            counts = np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(summed / counts)
+
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        embeddings = np.vstack(batches).astype(np.float32)
+        return _normalize(embeddings) if normalize_embeddings else embeddings
+
+def export_onnx_model(model_path, output_dir):
+    """
+    Export the SentenceTransformer transformer to ONNX and quantize its weights to int8.
+    Writes model.onnx, model_int8.onnx and the tokenizer files to output_dir.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    st_model = SentenceTransformer(model_path, device='cpu')
+    transformer = st_model[0].auto_model
+    tokenizer = st_model.tokenizer
+    transformer.eval()
+    # Return plain tuples so the first graph output is last_hidden_state
+    transformer.config.return_dict = False
+
+    sample = tokenizer(['sample resume experience'], return_tensors='pt')
+    input_names = [name for name in ['input_ids', 'attention_mask', 'token_type_ids'] if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+    fp32_path = os.path.join(output_dir, 'model.onnx')
+    int8_path = os.path.join(output_dir, 'model_int8.onnx')
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(output_dir)
+
+    return int8_path
@@ -0,0 +1,132 @@
+import hashlib
+import numpy as np
+from database import db
+from Models.candidate import ExperienceEmbedding
+from .modelRegistry import MODEL_NAME, get_backend_name
+from .experienceShortlister import preprocess_text, encode_texts
+
+# Bump when preprocessing or the model changes so stale vectors are recomputed
+EMBEDDING_VERSION = 'v1'
+# Vectors from different backends are close but not identical, so keep them apart
+MODEL_TAG = f"{MODEL_NAME}:{get_backend_name()}:{EMBEDDING_VERSION}"
+
+def hash_experience_text(processed_text):
+    """Hash of the preprocessed experience text, used to detect stale embeddings"""
+    return hashlib.sha256(processed_text.encode('utf-8')).hexdigest()
+
+def serialize_embedding(vector):
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+def deserialize_embedding(data):
+    return np.frombuffer(data, dtype=np.float32)
+
+def _upsert_embedding(candidate_id, text_hash, vector, row=None):
+    if row:
+        row.model_tag = MODEL_TAG
+        row.text_hash = text_hash
+        row.embedding = serialize_embedding(vector)
+    else:
+        db.session.add(ExperienceEmbedding(
+            candidate_id=candidate_id,
+            model_tag=MODEL_TAG,
+            text_hash=text_hash,
+            embedding=serialize_embedding(vector)
+        ))
+
+def store_experience_embedding(candidate_id, experience):
+    """
+    Compute and persist the experience embedding for one candidate.
+    Called when a resume is ingested; the caller is responsible for committing.
+    """
+    processed_experience = preprocess_text(experience)
+    if not processed_experience:
+        ExperienceEmbedding.query.filter_by(candidate_id=candidate_id).delete()
+        return
+
+    text_hash = hash_experience_text(processed_experience)
+    row = ExperienceEmbedding.query.get(candidate_id)
+    if row and row.model_tag == MODEL_TAG and row.text_hash == text_hash:
+        return
+
+    vector = encode_texts([processed_experience])[0]
+    _upsert_embedding(candidate_id, text_hash, vector, row)
+
+def store_experience_embeddings(experiences):
+    """
+    Batch form of store_experience_embedding for bulk ingestion.
+    experiences maps candidate_id -> experience text; existing rows are read with one
+    query and every changed text is encoded in a single batch. The caller commits.
+    """
+    hashes = {}
+    texts = {}
+    empty_ids = []
+    for candidate_id, experience in experiences.items():
+        processed_experience = preprocess_text(experience)
+        if processed_experience:
+            hashes[candidate_id] = hash_experience_text(processed_experience)
+            texts[candidate_id] = processed_experience
+        else:
+            empty_ids.append(candidate_id)
+
+    if empty_ids:
+        ExperienceEmbedding.query.filter(
+            ExperienceEmbedding.candidate_id.in_(empty_ids)
+        ).delete(synchronize_session=False)
+
+    if not hashes:
+        return
+
+    rows_by_id = {row.candidate_id: row for row in ExperienceEmbedding.query.filter(
+        ExperienceEmbedding.candidate_id.in_(list(hashes.keys()))
+    ).all()}
+
+    changed_ids = [
+        candidate_id for candidate_id in hashes
+        if not (candidate_id in rows_by_id
+                and rows_by_id[candidate_id].model_tag == MODEL_TAG
+                and rows_by_id[candidate_id].text_hash == hashes[candidate_id])
+    ]
+    if not changed_ids:
+        return
+
+    vectors = encode_texts([texts[candidate_id] for candidate_id in changed_ids])
+    for candidate_id, vector in zip(changed_ids, vectors):
+        _upsert_embedding(candidate_id, hashes[candidate_id], vector, rows_by_id.get(candidate_id))
+
+def get_experience_embeddings(candidates, backfill=True):
+    """
+    Look up persisted experience embeddings for the given candidates.
+    Returns a dict candidate_id -> normalised vector. Candidates without a current
+    embedding (missing, stale text or older model tag) are encoded in one batch and,
+    if backfill is set, persisted for the next run without committing.
+    """
+    hashes = {}
+    texts = {}
+    for candidate in candidates:
+        processed_experience = preprocess_text(candidate.get('experience'))
+        if processed_experience:
+            hashes[candidate['candidate_id']] = hash_experience_text(processed_experience)
+            texts[candidate['candidate_id']] = processed_experience
+
+    if not hashes:
+        return {}
+
+    rows = ExperienceEmbedding.query.filter(
+        ExperienceEmbedding.candidate_id.in_(list(hashes.keys()))
+    ).all()
+    rows_by_id = {row.candidate_id: row for row in rows}
+
+    embeddings = {}
+    for row in rows:
+        if row.model_tag == MODEL_TAG and hashes.get(row.candidate_id) == row.text_hash:
+            embeddings[row.candidate_id] = deserialize_embedding(row.embedding)
+
+    missing_ids = [candidate_id for candidate_id in hashes if candidate_id not in embeddings]
+    if missing_ids:
+        vectors = encode_texts([texts[candidate_id] for candidate_id in missing_ids])
+        for candidate_id, vector in zip(missing_ids, vectors):
+            embeddings[candidate_id] = vector
+            if backfill:
+                _upsert_embedding(candidate_id, hashes[candidate_id], vector, rows_by_id.get(candidate_id))
+
+    return embeddings
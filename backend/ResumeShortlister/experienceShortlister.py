@@ -1,10 +1,6 @@
-from sentence_transformers import SentenceTransformer, util
 import re
-import torch
 import numpy as np
-
-# Initialize the model - this will download the model if not already present
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from .modelRegistry import get_embedding_model
 
 def preprocess_text(text):
     """Clean and prepare text for embedding"""
@@ -23,7 +19,6 @@ def preprocess_text(text):
 def calculate_experience_similarity(candidate_experience, job_description):
 
     if not candidate_experience or not job_description:
-        print('nigga')
         return 0.0
     
     # Preprocess texts
@@ -34,16 +29,71 @@ def calculate_experience_similarity(candidate_experience, job_description):
         return 0.0
     
   
-    embeddings = model.encode([processed_experience, processed_job_desc])
+    embeddings = encode_texts([processed_experience, processed_job_desc])
     experience_embedding = embeddings[0]
     job_desc_embedding = embeddings[1]
     
-    
-    similarity = util.pytorch_cos_sim(experience_embedding, job_desc_embedding).item()
+    # Embeddings are normalised, so the dot product is the cosine similarity
+    similarity = np.dot(experience_embedding, job_desc_embedding)
     
 
     return float(similarity)
 
+def encode_texts(texts, batch_size=256):
+    """
+    Embed already preprocessed texts in batches.
+    Returns a float32 matrix of L2-normalised rows, so a dot product is the cosine similarity.
+    """
+    embeddings = get_embedding_model().encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    return np.asarray(embeddings, dtype=np.float32)
+
+def calculate_experience_similarities(candidate_experiences, job_description, batch_size=256, stored_embeddings=None):
+    """
+    Score many candidate experiences against one job description.
+    The job description is embedded once and experiences are embedded in batches,
+    then all cosine similarities are computed with a single matrix operation.
+    stored_embeddings is an optional list aligned with candidate_experiences holding
+    precomputed normalised vectors (or None); only the missing ones are encoded.
+    """
+    similarities = [0.0] * len(candidate_experiences)
+
+    processed_job_desc = preprocess_text(job_description) if job_description else ""
+    if not processed_job_desc:
+        return similarities
+
+    # Only score candidates that actually have experience text
+    indices = []
+    vectors = []
+    missing_indices = []
+    missing_texts = []
+    for idx, experience in enumerate(candidate_experiences):
+        processed_experience = preprocess_text(experience) if experience else ""
+        if not processed_experience:
+            continue
+
+        stored = stored_embeddings[idx] if stored_embeddings else None
+        if stored is not None:
+            indices.append(idx)
+            vectors.append(stored)
+        else:
+            missing_indices.append(idx)
+            missing_texts.append(processed_experience)
+
+    if missing_texts:
+        indices.extend(missing_indices)
+        vectors.extend(encode_texts(missing_texts, batch_size=batch_size))
+
+    if not vectors:
+        return similarities
+
+    job_desc_embedding = encode_texts([processed_job_desc])[0]
+    scores = np.vstack(vectors) @ job_desc_embedding
+
+    for idx, score in zip(indices, scores.tolist()):
+        similarities[idx] = float(score)
+
+    return similarities
+
 def experience_years_match(candidate_years, job_description):
 
     if candidate_years is None or not job_description:
@@ -92,18 +142,26 @@ def experience_years_match(candidate_years, job_description):
     
     return 0.7 
 
-def shortlist_by_experience(candidates, job_details):
+def shortlist_by_experience(candidates, job_details, stored_embeddings=None):
 
     job_description = job_details.get('description', '')
     
+    # stored_embeddings maps candidate_id -> embedding persisted at ingest time
+    aligned_embeddings = None
+    if stored_embeddings:
+        aligned_embeddings = [stored_embeddings.get(candidate.get('candidate_id')) for candidate in candidates]
+    
+    # Embed all experiences in batches instead of one forward pass per candidate
+    similarity_scores = calculate_experience_similarities(
+        [candidate.get('experience', '') for candidate in candidates],
+        job_description,
+        stored_embeddings=aligned_embeddings
+    )
+    
     scored_candidates = []
-    for candidate in candidates:
-        candidate_experience = candidate.get('experience', '')
+    for candidate, similarity_score in zip(candidates, similarity_scores):
         years_experience = candidate.get('years_experience')
         
-   
-        similarity_score = calculate_experience_similarity(candidate_experience, job_description)
-        
         
         years_match_score = experience_years_match(years_experience, job_description)
         
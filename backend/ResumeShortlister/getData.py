@@ -1,6 +1,8 @@
+from sqlalchemy.orm import selectinload
 from database import db
 from Models.company import Company
 from Models.candidate import Candidate, Education, Skills, AppliedCandidate
+from .skillIndex import find_candidates_by_skills
 
 def get_job_details(job_id):
 
@@ -17,58 +19,133 @@ def get_job_details(job_id):
         'skills_required': job.skills_required,
         'education_qualification': job.education_qualification,
         'description': job.description,
-        'stipend': job.stipend
+        'stipend': job.stipend,
+        'scoring_version': job.scoring_version
     }
 
-def get_applied_candidates(job_id):
+def serialize_applied_candidate(application, candidate, include_scores=False):
 
-    # Find all applications for this job
-    applications = AppliedCandidate.query.filter_by(job_id=job_id).all()
+    # Get education details
+    education = []
+    for edu in candidate.education:
+        education.append({
+            'degree': edu.degree,
+            'institution': edu.institution,
+            'graduation_year': edu.graduation_year,
+            'gpa': float(edu.gpa) if edu.gpa else None
+        })
     
-    candidates_list = []
-    for application in applications:
-        candidate = Candidate.query.get(application.candidate_id)
-        
-        if candidate:
-            # Get education details
-            education = []
-            for edu in candidate.education:
-                education.append({
-                    'degree': edu.degree,
-                    'institution': edu.institution,
-                    'graduation_year': edu.graduation_year,
-                    'gpa': float(edu.gpa) if edu.gpa else None
-                })
-            
-            # Get skills details
-            skills = []
-            for skill in candidate.skills:
-                skills.append({
-                    'skill_name': skill.skill_name,
-                    'category': skill.skill_category.value if skill.skill_category else None,
-                    'proficiency': skill.proficiency_level.value if skill.proficiency_level else None
-                })
-            
-            # Compile candidate data
-            candidate_data = {
-                'candidate_id': candidate.candidate_id,
-                'fullname': candidate.fullname,
-                'email': candidate.email,
-                'phone': candidate.phone,
-                'location': candidate.location,
-                'years_experience': candidate.years_experience,
-                'experience': candidate.experience,
-                'resume_file_path': candidate.resume_file_path,
-                'status': candidate.status,
-                'applied_at': application.applied_at.strftime('%Y-%m-%d %H:%M:%S') if application.applied_at else None,
-                'shortlisted': application.shortlisted,
-                'education': education,
-                'skills': skills
-            }
-            
-            candidates_list.append(candidate_data)
+    # Get skills details
+    skills = []
+    for skill in candidate.skills:
+        skills.append({
+            'skill_name': skill.skill_name,
+            'canonical_skill': skill.canonical_skill,
+            'category': skill.skill_category.value if skill.skill_category else None,
+            'proficiency': skill.proficiency_level.value if skill.proficiency_level else None
+        })
     
-    return candidates_list
+    # Compile candidate data
+    candidate_data = {
+        'application_id': application.application_id,
+        'candidate_id': candidate.candidate_id,
+        'fullname': candidate.fullname,
+        'email': candidate.email,
+        'phone': candidate.phone,
+        'location': candidate.location,
+        'years_experience': candidate.years_experience,
+        'experience': candidate.experience,
+        'resume_file_path': candidate.resume_file_path,
+        'status': candidate.status,
+        'profile_version': candidate.profile_version,
+        'applied_at': application.applied_at.strftime('%Y-%m-%d %H:%M:%S') if application.applied_at else None,
+        'shortlisted': application.shortlisted,
+        'education': education,
+        'skills': skills
+    }
+    
+    # Attach scores persisted by the last shortlisting run
+    if include_scores:
+        score_details = application.score_details or {}
+        candidate_data.update({
+            'skill_score': application.skill_score,
+            'skill_match_details': score_details.get('skill_match_details'),
+            'experience_score': application.experience_score,
+            'experience_match_details': score_details.get('experience_match_details'),
+            'aggregate_score': application.compatibility_score,
+            'education_passed': application.education_passed
+        })
+    
+    return candidate_data
+
+def iter_applied_candidates(job_id, candidate_ids=None, chunk_size=1000, include_scores=False):
+    """
+    Stream applicants of a job in chunks of chunk_size.
+    Each chunk costs three queries: applications joined to candidates, then education
+    and skills loaded with selectinload, regardless of how many candidates it holds.
+    """
+    if candidate_ids is not None and not candidate_ids:
+        return
+
+    last_application_id = 0
+    while True:
+        # Keyset pagination on application_id keeps every chunk an index range scan
+        query = db.session.query(AppliedCandidate, Candidate).join(
+            Candidate, Candidate.candidate_id == AppliedCandidate.candidate_id
+        ).filter(
+            AppliedCandidate.job_id == job_id,
+            AppliedCandidate.application_id > last_application_id
+        ).options(
+            selectinload(Candidate.education),
+            selectinload(Candidate.skills)
+        )
+        if candidate_ids is not None:
+            query = query.filter(AppliedCandidate.candidate_id.in_(list(candidate_ids)))
+
+        rows = query.order_by(AppliedCandidate.application_id).limit(chunk_size).all()
+        if not rows:
+            return
+
+        for application, candidate in rows:
+            yield serialize_applied_candidate(application, candidate, include_scores)
+
+        if len(rows) < chunk_size:
+            return
+        last_application_id = rows[-1][0].application_id
+
+def get_applied_candidates(job_id, candidate_ids=None, include_scores=False):
+
+    # Find all applications for this job, optionally restricted to prefiltered candidates
+    return list(iter_applied_candidates(job_id, candidate_ids, include_scores=include_scores))
+
+def partition_by_score_freshness(job_id, job_version, candidate_ids=None):
+    """
+    Split applicants into those whose persisted scores are stale and those still current.
+    Scores are current when they were computed against the job's scoring_version and
+    the candidate's profile_version. Returns (stale_ids, fresh_ids).
+    """
+    query = db.session.query(
+        AppliedCandidate.candidate_id,
+        AppliedCandidate.scored_job_version,
+        AppliedCandidate.scored_profile_version,
+        Candidate.profile_version
+    ).join(
+        Candidate, Candidate.candidate_id == AppliedCandidate.candidate_id
+    ).filter(AppliedCandidate.job_id == job_id)
+    if candidate_ids is not None:
+        if not candidate_ids:
+            return set(), set()
+        query = query.filter(AppliedCandidate.candidate_id.in_(list(candidate_ids)))
+
+    stale_ids = set()
+    fresh_ids = set()
+    for row in query.all():
+        if row.scored_job_version == job_version and row.scored_profile_version == row.profile_version:
+            fresh_ids.add(row.candidate_id)
+        else:
+            stale_ids.add(row.candidate_id)
+
+    return stale_ids, fresh_ids
 
 def get_shortlisting_data(job_id):
 
@@ -80,11 +157,21 @@ def get_shortlisting_data(job_id):
             'message': 'Job not found'
         }
     
-    candidates = get_applied_candidates(job_id)
+    # Only load applicants sharing enough required skills, using the skill index
+    candidate_ids = find_candidates_by_skills(job_id, job_details.get('skills_required'))
+    
+    # Applicants whose job or profile changed since they were scored need rescoring;
+    # everyone else is served from persisted scores
+    stale_ids, fresh_ids = partition_by_score_freshness(job_id, job_details['scoring_version'], candidate_ids)
+    candidates = get_applied_candidates(job_id, stale_ids)
+    scored_candidates = get_applied_candidates(job_id, fresh_ids, include_scores=True)
     
     return {
         'success': True,
         'job': job_details,
         'candidates': candidates,
-        'total_candidates': len(candidates)
+        'scored_candidates': scored_candidates,
+        # Applicants kept by the skill prefilter, None when nothing was filtered
+        'prefiltered_ids': candidate_ids,
+        'total_candidates': len(candidates) + len(scored_candidates)
     }
\ No newline at end of file
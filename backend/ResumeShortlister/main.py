@@ -2,9 +2,34 @@ from .getData import get_shortlisting_data
 from .educationShortlister import shortlist_by_education
 from .skillShortlister import shortlist_by_skills
 from .experienceShortlister import shortlist_by_experience
+from .embeddingStore import get_experience_embeddings
+from sqlalchemy import or_
 from database import db
 from Models.candidate import AppliedCandidate
 
+def reset_prefiltered_scores(job_id, kept_ids):
+    """
+    Clear scores left by earlier runs on applicants the skill prefilter now excludes,
+    so stale scores never rank alongside fresh ones. They are left unscored, which
+    makes them stale and rescored if they pass the prefilter later.
+    """
+    if kept_ids is None:
+        return
+    
+    AppliedCandidate.query.filter(
+        AppliedCandidate.job_id == job_id,
+        ~AppliedCandidate.candidate_id.in_(list(kept_ids)),
+        or_(AppliedCandidate.scored_job_version.isnot(None), AppliedCandidate.compatibility_score != 0)
+    ).update({
+        'compatibility_score': 0.0,
+        'skill_score': None,
+        'experience_score': None,
+        'education_passed': None,
+        'score_details': None,
+        'scored_job_version': None,
+        'scored_profile_version': None
+    }, synchronize_session=False)
+
 def shortlist_candidates(job_id):
 
     # Get job details and candidates
@@ -15,9 +40,13 @@ def shortlist_candidates(job_id):
     
     job_details = data['job']
     candidates = data['candidates']
+    scored_candidates = data.get('scored_candidates', [])
+    
+    reset_prefiltered_scores(job_id, data.get('prefiltered_ids'))
     
     # If no candidates or job details, return early
-    if not candidates or not job_details:
+    if (not candidates and not scored_candidates) or not job_details:
+        db.session.commit()
         return {
             'success': True,
             'message': 'No candidates to shortlist',
@@ -25,6 +54,9 @@ def shortlist_candidates(job_id):
             'total_candidates': 0
         }
     
+    # Only candidates whose job or profile changed since the last run go through
+    # the scoring stages below; the rest reuse their persisted scores
+    
     # Step 1: Apply education shortlisting if qualifications specified
     education_qualified = candidates
     if job_details.get('education_qualification'):
@@ -33,11 +65,13 @@ def shortlist_candidates(job_id):
     # Step 2: Apply skill shortlisting to get skill scores
     skill_scored_candidates = shortlist_by_skills(education_qualified, job_details)
     
-    # Step 3: Apply experience shortlisting to get experience scores
-    experience_scored_candidates = shortlist_by_experience(skill_scored_candidates, job_details)
+    # Step 3: Apply experience shortlisting to get experience scores,
+    # using experience embeddings persisted at ingest time
+    stored_embeddings = get_experience_embeddings(skill_scored_candidates)
+    experience_scored_candidates = shortlist_by_experience(skill_scored_candidates, job_details, stored_embeddings)
     
     # Step 4: Calculate aggregate score for each candidate
-    ranked_candidates = []
+    newly_ranked = []
     for candidate in experience_scored_candidates:
         # Get individual scores, defaulting to 0 if not present
         skill_score = candidate.get('skill_score', 0)
@@ -51,24 +85,50 @@ def shortlist_candidates(job_id):
         candidate_with_aggregate = candidate.copy()
         candidate_with_aggregate['aggregate_score'] = aggregate_score
         
-        ranked_candidates.append(candidate_with_aggregate)
+        newly_ranked.append(candidate_with_aggregate)
     
-    # Sort candidates by aggregate score in descending order
-    ranked_candidates.sort(key=lambda c: c.get('aggregate_score', 0), reverse=True)
+    # Persist aggregate and component scores in one executemany keyed by application_id,
+    # stamped with the versions they were computed against
+    score_updates = [{
+        'application_id': candidate['application_id'],
+        'compatibility_score': candidate['aggregate_score'],
+        'skill_score': candidate.get('skill_score', 0),
+        'experience_score': candidate.get('experience_score', 0),
+        'education_passed': True,
+        'score_details': {
+            'skill_match_details': candidate.get('skill_match_details'),
+            'experience_match_details': candidate.get('experience_match_details')
+        },
+        'scored_job_version': job_details['scoring_version'],
+        'scored_profile_version': candidate['profile_version']
+    } for candidate in newly_ranked]
     
-
-    for candidate in ranked_candidates:
-        application = AppliedCandidate.query.filter_by(
-            job_id=job_id,
-            candidate_id=candidate['candidate_id']
-        ).first()
-        
-        if application:
-            application.compatibility_score = candidate['aggregate_score']
+    # Candidates that failed the education requirement are not ranked
+    qualified_ids = {candidate['application_id'] for candidate in education_qualified}
+    score_updates.extend({
+        'application_id': candidate['application_id'],
+        'compatibility_score': 0.0,
+        'skill_score': None,
+        'experience_score': None,
+        'education_passed': False,
+        'score_details': None,
+        'scored_job_version': job_details['scoring_version'],
+        'scored_profile_version': candidate['profile_version']
+    } for candidate in candidates if candidate['application_id'] not in qualified_ids)
     
+    if score_updates:
+        db.session.bulk_update_mappings(AppliedCandidate, score_updates)
  
     db.session.commit()
     
+    # Merge with candidates served from persisted scores
+    ranked_candidates = newly_ranked + [
+        candidate for candidate in scored_candidates if candidate.get('education_passed')
+    ]
+    
+    # Sort candidates by aggregate score in descending order
+    ranked_candidates.sort(key=lambda c: c.get('aggregate_score', 0), reverse=True)
+    
   
     return {
         'success': True,
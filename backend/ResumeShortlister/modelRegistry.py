@@ -0,0 +1,156 @@
+import os
+import time
+import threading
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+_models = {}
+_lock = threading.Lock()
+
+def get_model_path():
+    """
+    Location the embedding model is loaded from.
+    EMBEDDING_MODEL_PATH points to a local copy so workers never download at request time;
+    falls back to the hub name when it is not set.
+    """
+    return os.getenv('EMBEDDING_MODEL_PATH') or MODEL_NAME
+
+def get_onnx_model_path():
+    """Directory holding the exported int8 ONNX model and its tokenizer"""
+    return os.getenv('ONNX_MODEL_PATH') or os.path.join(os.getcwd(), 'ModelCache', f'{MODEL_NAME}-onnx-int8')
+
+def get_backend_name():
+    """Embedding backend selected with EMBEDDING_BACKEND: 'torch' (default) or 'onnx'"""
+    backend = os.getenv('EMBEDDING_BACKEND', 'torch').lower()
+    return backend if backend in ('torch', 'onnx') else 'torch'
+
+def load_backend(backend_name):
+    """Build a new embedding backend without caching it"""
+    from .embeddingBackends import TorchEmbeddingBackend, OnnxEmbeddingBackend
+
+    if backend_name == 'onnx':
+        return OnnxEmbeddingBackend(get_onnx_model_path())
+    return TorchEmbeddingBackend(get_model_path())
+
+def get_embedding_model():
+    """Return the shared embedding backend for this process, loading it on first use"""
+    model = _models.get('embedding')
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get('embedding')
+        if model is None:
+            model = load_backend(get_backend_name())
+            _models['embedding'] = model
+    return model
+
+def warmup_models():
+    """
+    Load the embedding model and run one encode so lazy initialisation happens now.
+    Call this in the master process before the WSGI server forks (e.g. gunicorn --preload
+    with PRELOAD_MODELS=true) so workers share the weights copy-on-write.
+    """
+    model = get_embedding_model()
+    model.encode(['warmup'])
+    return model
+
+def _sample_experiences(limit):
+    """Real candidate experiences from the database, padded with synthetic ones"""
+    from Models.candidate import Candidate
+
+    rows = Candidate.query.with_entities(Candidate.experience).filter(
+        Candidate.experience.isnot(None)
+    ).limit(limit).all()
+    texts = [row.experience for row in rows if row.experience]
+
+    while len(texts) < limit:
+        texts.append(
+            f"{len(texts) % 10 + 1} years of experience as a software engineer building "
+            "python flask apis, react frontends and postgresql databases"
+        )
+    return texts
+
+def check_backend_parity(texts, job_description, tolerance=0.02):
+    """
+    Compare cosine scores of the torch and onnx backends on the same texts.
+    Returns a dict with the maximum absolute score difference and whether it is within tolerance.
+    """
+    from .experienceShortlister import preprocess_text
+
+    processed = [preprocess_text(text) for text in texts]
+    processed_job = preprocess_text(job_description)
+
+    scores = {}
+    for backend_name in ('torch', 'onnx'):
+        backend = load_backend(backend_name)
+        embeddings = backend.encode(processed, normalize_embeddings=True)
+        job_embedding = backend.encode([processed_job], normalize_embeddings=True)[0]
+        scores[backend_name] = embeddings @ job_embedding
+
+    max_diff = float(np.max(np.abs(scores['torch'] - scores['onnx']))) if len(texts) else 0.0
+    return {
+        'samples': len(texts),
+        'max_abs_diff': max_diff,
+        'tolerance': tolerance,
+        'passed': max_diff <= tolerance
+    }
+
+def benchmark_backends(texts, batch_size=256):
+    """Throughput of each backend in candidates per second"""
+    from .experienceShortlister import preprocess_text
+
+    processed = [preprocess_text(text) for text in texts]
+    results = {}
+    for backend_name in ('torch', 'onnx'):
+        backend = load_backend(backend_name)
+        backend.encode(processed[:batch_size], batch_size=batch_size)  # warmup
+
+        start = time.perf_counter()
+        backend.encode(processed, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+
+        results[backend_name] = len(processed) / elapsed if elapsed > 0 else float('inf')
+    return results
+
+def register_model_commands(app):
+    import click
+
+    @app.cli.command('warmup-models')
+    def warmup_models_command():
+        """Load the shortlisting models ahead of the first request"""
+        warmup_models()
+        print(f'Models loaded ({get_backend_name()} backend)')
+
+    @app.cli.command('export-onnx-model')
+    def export_onnx_model_command():
+        """Export the embedding model to an int8-quantized ONNX model"""
+        from .embeddingBackends import export_onnx_model
+        path = export_onnx_model(get_model_path(), get_onnx_model_path())
+        print(f'Quantized ONNX model written to {path}')
+
+    @app.cli.command('embedding-parity')
+    @click.option('--samples', default=200, help='Number of experiences to compare')
+    @click.option('--tolerance', default=0.02, help='Maximum allowed cosine score difference')
+    def embedding_parity_command(samples, tolerance):
+        """Check that onnx cosine scores stay within tolerance of torch"""
+        job_description = 'Looking for a backend engineer with 3+ years of python and sql experience'
+        result = check_backend_parity(_sample_experiences(samples), job_description, tolerance)
+        print(f"Max score difference over {result['samples']} samples: {result['max_abs_diff']:.4f} "
+              f"(tolerance {tolerance}) - {'PASSED' if result['passed'] else 'FAILED'}")
+        if not result['passed']:
+            raise SystemExit(1)
+
+    @app.cli.command('embedding-benchmark')
+    @click.option('--samples', default=1000, help='Number of experiences to encode')
+    @click.option('--batch-size', default=256, help='Encoding batch size')
+    def embedding_benchmark_command(samples, batch_size):
+        """Compare torch and onnx throughput in candidates per second"""
+        results = benchmark_backends(_sample_experiences(samples), batch_size)
+        for backend_name, throughput in results.items():
+            print(f'{backend_name}: {throughput:.1f} candidates/sec')
@@ -0,0 +1,144 @@
+import re
+from functools import lru_cache
+from nltk.stem import WordNetLemmatizer
+
+# Upper bound on memoised skill strings kept per process
+SKILL_CACHE_SIZE = 50000
+
+# Curated aliases, keyed by the compact form of the raw skill (see compact_skill)
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'javascript': 'javascript',
+    'ecmascript': 'javascript',
+    'es6': 'javascript',
+    'ts': 'typescript',
+    'typescript': 'typescript',
+    'react': 'react',
+    'reactjs': 'react',
+    'reactnative': 'react native',
+    'angularjs': 'angular',
+    'angular': 'angular',
+    'vue': 'vue',
+    'vuejs': 'vue',
+    'node': 'nodejs',
+    'nodejs': 'nodejs',
+    'expressjs': 'express',
+    'express': 'express',
+    'nextjs': 'nextjs',
+    'py': 'python',
+    'python3': 'python',
+    'python': 'python',
+    'golang': 'go',
+    'go': 'go',
+    'c++': 'cpp',
+    'cpp': 'cpp',
+    'c#': 'csharp',
+    'csharp': 'csharp',
+    'net': 'dotnet',
+    'dotnet': 'dotnet',
+    'aspnet': 'aspnet',
+    'postgres': 'postgresql',
+    'postgresql': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'mongodb': 'mongodb',
+    'mysql': 'mysql',
+    'mssql': 'sql server',
+    'sqlserver': 'sql server',
+    'k8s': 'kubernetes',
+    'kubernetes': 'kubernetes',
+    'aws': 'amazon web services',
+    'amazonwebservices': 'amazon web services',
+    'gcp': 'google cloud',
+    'googlecloudplatform': 'google cloud',
+    'googlecloud': 'google cloud',
+    'azure': 'microsoft azure',
+    'microsoftazure': 'microsoft azure',
+    'ml': 'machine learning',
+    'machinelearning': 'machine learning',
+    'dl': 'deep learning',
+    'deeplearning': 'deep learning',
+    'ai': 'artificial intelligence',
+    'artificialintelligence': 'artificial intelligence',
+    'nlp': 'natural language processing',
+    'naturallanguageprocessing': 'natural language processing',
+    'cv': 'computer vision',
+    'computervision': 'computer vision',
+    'tf': 'tensorflow',
+    'tensorflow': 'tensorflow',
+    'pytorch': 'pytorch',
+    'torch': 'pytorch',
+    'sklearn': 'scikit learn',
+    'scikitlearn': 'scikit learn',
+    'html5': 'html',
+    'html': 'html',
+    'css3': 'css',
+    'css': 'css',
+    'restapi': 'rest api',
+    'restapis': 'rest api',
+    'restful': 'rest api',
+    'restfulapi': 'rest api',
+    'restfulapis': 'rest api',
+    'ci/cd': 'ci cd',
+    'cicd': 'ci cd',
+    'oop': 'object oriented programming',
+    'oops': 'object oriented programming',
+    'objectorientedprogramming': 'object oriented programming',
+    'dsa': 'data structures and algorithms',
+    'datastructuresandalgorithms': 'data structures and algorithms',
+    'msexcel': 'excel',
+    'excel': 'excel',
+}
+
+_lemmatizer = WordNetLemmatizer()
+
+def compact_skill(skill):
+    """Lowercase and drop separators, keeping characters that distinguish languages (c++, c#)"""
+    return re.sub(r'[^a-z0-9+#/]', '', skill.lower()) if skill else ""
+
+@lru_cache(maxsize=SKILL_CACHE_SIZE)
+def preprocess_skill(skill):
+    if not skill:
+        return ""
+
+    # Convert to lowercase and remove special characters
+    skill = skill.lower().strip()
+    skill = re.sub(r'[^\w\s]', ' ', skill)
+
+    words = [word for word in skill.split()]
+
+    # Lemmatize words to handle different forms
+    words = [_lemmatizer.lemmatize(word) for word in words]
+
+    return ' '.join(words)
+
+@lru_cache(maxsize=SKILL_CACHE_SIZE)
+def canonicalize_skill(skill):
+    """
+    Map a raw skill name to its canonical skill ID.
+    Known aliases resolve through SKILL_ALIASES ("React.js" -> "react"); anything else
+    falls back to the normalised form used for fuzzy matching.
+    """
+    if not skill:
+        return ""
+
+    alias = SKILL_ALIASES.get(compact_skill(skill))
+    if alias:
+        return alias
+
+    return preprocess_skill(skill)
+
+def register_skill_commands(app):
+
+    @app.cli.command('canonicalize-skills')
+    def canonicalize_skills_command():
+        """Fill canonical_skill for skill rows written before it existed"""
+        from database import db
+        from Models.candidate import Skills
+
+        updated = 0
+        for skill in Skills.query.filter(Skills.canonical_skill.is_(None)).all():
+            skill.canonical_skill = canonicalize_skill(skill.skill_name) or None
+            updated += 1
+        db.session.commit()
+        print(f'Canonicalized {updated} skills')
@@ -0,0 +1,93 @@
+import os
+import numpy as np
+from database import db
+from Models.candidate import Skills, AppliedCandidate
+from .skillCanonicalizer import canonicalize_skill
+from .skillShortlister import parse_required_skills, compute_skill_similarity_matrix
+
+# Same threshold match_skills uses to accept a fuzzy match
+FUZZY_MATCH_THRESHOLD = 0.7
+
+def get_prefilter_settings():
+    """
+    SKILL_PREFILTER_MIN_SHARED: required skills a candidate must share to be scored.
+    SKILL_PREFILTER_MAX_EXPANSIONS: fuzzy neighbours considered per required skill.
+    """
+    min_shared = int(os.getenv('SKILL_PREFILTER_MIN_SHARED', 1))
+    max_expansions = int(os.getenv('SKILL_PREFILTER_MAX_EXPANSIONS', 5))
+    return min_shared, max_expansions
+
+def _applicant_skills_query(job_id, *columns):
+    return db.session.query(*columns).join(
+        AppliedCandidate, AppliedCandidate.candidate_id == Skills.candidate_id
+    ).filter(AppliedCandidate.job_id == job_id)
+
+def expand_required_skills(required_skills, applicant_skills, max_expansions):
+    """
+    Map each canonical skill worth looking up to the required skills it covers:
+    the exact canonical ID plus at most max_expansions fuzzy neighbours from the applicant pool.
+    """
+    coverage = {}
+    for req_idx, skill in enumerate(required_skills):
+        canonical = canonicalize_skill(skill)
+        if canonical:
+            coverage.setdefault(canonical, set()).add(req_idx)
+
+    if not applicant_skills or max_expansions <= 0:
+        return coverage
+
+    matrix, columns = compute_skill_similarity_matrix(required_skills, applicant_skills)
+    names = list(columns.keys())
+    for req_idx in range(matrix.shape[0]):
+        row = matrix[req_idx]
+        for col_idx in np.argsort(-row)[:max_expansions]:
+            if row[col_idx] <= FUZZY_MATCH_THRESHOLD:
+                break
+            coverage.setdefault(names[col_idx], set()).add(req_idx)
+
+    return coverage
+
+def find_candidates_by_skills(job_id, required_skills_str, min_shared=None, max_expansions=None):
+    """
+    Use the (canonical_skill, candidate_id) index on Skills to find applicants of a job
+    that share at least min_shared required skills, exactly or through a fuzzy neighbour.
+    Returns a set of candidate IDs, or None when the job lists no skills (no filtering).
+    Applicants with skills that have not been canonicalized yet are always kept.
+    """
+    required_skills = parse_required_skills(required_skills_str)
+    if not required_skills:
+        return None
+
+    default_min_shared, default_max_expansions = get_prefilter_settings()
+    min_shared = default_min_shared if min_shared is None else min_shared
+    max_expansions = default_max_expansions if max_expansions is None else max_expansions
+    min_shared = min(min_shared, len(required_skills))
+
+    applicant_skills = [
+        row.canonical_skill for row in _applicant_skills_query(job_id, Skills.canonical_skill)
+        .filter(Skills.canonical_skill.isnot(None))
+        .distinct()
+        .all()
+    ]
+
+    coverage = expand_required_skills(required_skills, applicant_skills, max_expansions)
+    if not coverage:
+        return None
+
+    rows = _applicant_skills_query(job_id, Skills.candidate_id, Skills.canonical_skill).filter(
+        Skills.canonical_skill.in_(list(coverage.keys()))
+    ).distinct().all()
+
+    covered = {}
+    for row in rows:
+        covered.setdefault(row.candidate_id, set()).update(coverage[row.canonical_skill])
+
+    candidate_ids = {candidate_id for candidate_id, skills in covered.items() if len(skills) >= min_shared}
+
+    # Rows written before canonical_skill existed are not in the index yet
+    unindexed = _applicant_skills_query(job_id, Skills.candidate_id).filter(
+        Skills.canonical_skill.is_(None)
+    ).distinct().all()
+    candidate_ids.update(row.candidate_id for row in unindexed)
+
+    return candidate_ids
@@ -1,41 +1,40 @@
-import re
-from difflib import SequenceMatcher
-import nltk
-from nltk.stem import WordNetLemmatizer
+import numpy as np
+from rapidfuzz import fuzz, process
 from Models.candidate import ProficiencyLevel
+from .skillCanonicalizer import canonicalize_skill
 
 
 # nltk.download('wordnet')
 
-def preprocess_skill(skill):
-    if not skill:
-        return ""
-        
-    # Convert to lowercase and remove special characters
-    skill = skill.lower().strip()
-    skill = re.sub(r'[^\w\s]', ' ', skill)
-    
-    # Remove common words that don't add meaning
-    
-    words = [word for word in skill.split()]
-    
-    # Lemmatize words to handle different forms
-    lemmatizer = WordNetLemmatizer()
-    words = [lemmatizer.lemmatize(word) for word in words]
-    
-    return ' '.join(words)
+def get_canonical_skill(cand_skill):
+    """Canonical skill ID stored on the row, computed on the fly for rows written before it existed"""
+    return cand_skill.get('canonical_skill') or canonicalize_skill(cand_skill.get('skill_name', ''))
 
-def calculate_skill_similarity(skill1, skill2):
+def compute_skill_similarity_matrix(required_skills, canonical_skills):
+    """
+    Similarity of every required skill against every distinct canonical candidate skill in one call.
+    Returns (matrix, column index by canonical skill ID): rapidfuzz's ratio, except that
+    pairs where either skill is shorter than four characters only score on an exact match.
+    """
+    distinct_skills = list(dict.fromkeys(skill or '' for skill in canonical_skills))
+    columns = {skill: idx for idx, skill in enumerate(distinct_skills)}
+
+    canonical_required = [canonicalize_skill(skill) for skill in required_skills]
+
+    if not canonical_required or not distinct_skills:
+        return np.zeros((len(canonical_required), len(distinct_skills)), dtype=np.float32), columns
+
+    matrix = process.cdist(canonical_required, distinct_skills, scorer=fuzz.ratio, dtype=np.float32, workers=-1) / 100.0
 
-    proc_skill1 = preprocess_skill(skill1)
-    proc_skill2 = preprocess_skill(skill2)
-    
     # For very short skills, be more strict in matching
-    if len(proc_skill1) < 4 or len(proc_skill2) < 4:
-        return 1.0 if proc_skill1 == proc_skill2 else 0.0
-    
-    # Calculate similarity ratio
-    return SequenceMatcher(None, proc_skill1, proc_skill2).ratio()
+    required_short = np.array([len(skill) < 4 for skill in canonical_required])
+    skills_short = np.array([len(skill) < 4 for skill in distinct_skills])
+    strict = required_short[:, None] | skills_short[None, :]
+    if strict.any():
+        exact = np.array([[req == skill for skill in distinct_skills] for req in canonical_required])
+        matrix = np.where(strict, exact.astype(np.float32), matrix)
+
+    return matrix, columns
 
 def get_proficiency_score(proficiency_level):
     if not proficiency_level:
@@ -50,8 +49,17 @@ def get_proficiency_score(proficiency_level):
     
     return proficiency_scores.get(proficiency_level, 0.5)
 
-def match_skills(required_skills_str, candidate_skills):
+def parse_required_skills(required_skills_str):
+    if not required_skills_str:
+        return []
+    return [skill.strip() for skill in required_skills_str.split(',') if skill.strip()]
 
+def match_skills(required_skills_str, candidate_skills, similarity_matrix=None):
+    """
+    Greedily match each required skill to the best unused candidate skill.
+    similarity_matrix is an optional (matrix, columns) pair from compute_skill_similarity_matrix
+    covering these skill names; it is computed here when not supplied.
+    """
     if not required_skills_str or not candidate_skills:
         return {
             'score': 0.0,
@@ -61,7 +69,13 @@ def match_skills(required_skills_str, candidate_skills):
         }
     
     # Parse required skills
-    required_skills = [skill.strip() for skill in required_skills_str.split(',') if skill.strip()]
+    required_skills = parse_required_skills(required_skills_str)
+    
+    candidate_canonical = [get_canonical_skill(cand_skill) for cand_skill in candidate_skills]
+    
+    if similarity_matrix is None:
+        similarity_matrix = compute_skill_similarity_matrix(required_skills, candidate_canonical)
+    matrix, columns = similarity_matrix
     
     # Track matches for each required skill
     skill_matches = []
@@ -69,25 +83,34 @@ def match_skills(required_skills_str, candidate_skills):
     missing_skills = []
     
     # For each required skill, find the best match in candidate skills
-    for req_skill in required_skills:
+    for req_idx, req_skill in enumerate(required_skills):
         best_match = None
         best_match_score = 0
         best_match_proficiency = 0
+        req_canonical = canonicalize_skill(req_skill)
         
-        for cand_skill in candidate_skills:
-            # Skip if we've already matched this candidate skill
-            if cand_skill in matched_skills:
-                continue
-                
-            skill_name = cand_skill.get('skill_name', '')
-            sim_score = calculate_skill_similarity(req_skill, skill_name)
-            
-            # Consider as a match if similarity is high enough
-            if sim_score > 0.7 and sim_score > best_match_score:
+        # Exact canonical matches are the best possible score, so skip fuzzy scoring
+        for cand_skill, cand_canonical in zip(candidate_skills, candidate_canonical):
+            if req_canonical and cand_canonical == req_canonical and cand_skill not in matched_skills:
                 best_match = cand_skill
-                best_match_score = sim_score
-                prof = cand_skill.get('proficiency', 'intermediate')
-                best_match_proficiency = get_proficiency_score(prof)
+                best_match_score = 1.0
+                best_match_proficiency = get_proficiency_score(cand_skill.get('proficiency', 'intermediate'))
+                break
+        
+        if best_match is None:
+            for cand_skill, cand_canonical in zip(candidate_skills, candidate_canonical):
+                # Skip if we've already matched this candidate skill
+                if cand_skill in matched_skills:
+                    continue
+                    
+                sim_score = float(matrix[req_idx, columns[cand_canonical or '']])
+                
+                # Consider as a match if similarity is high enough
+                if sim_score > 0.7 and sim_score > best_match_score:
+                    best_match = cand_skill
+                    best_match_score = sim_score
+                    prof = cand_skill.get('proficiency', 'intermediate')
+                    best_match_proficiency = get_proficiency_score(prof)
         
         # If we found a good match
         if best_match:
@@ -148,12 +171,18 @@ def shortlist_by_skills(candidates, job_details):
 
     required_skills = job_details.get('skills_required', '')
     
+    # Score every required skill against every distinct skill in the applicant pool at once
+    similarity_matrix = compute_skill_similarity_matrix(
+        parse_required_skills(required_skills),
+        [get_canonical_skill(skill) for candidate in candidates for skill in candidate.get('skills', [])]
+    )
+    
     scored_candidates = []
     for candidate in candidates:
         candidate_skills = candidate.get('skills', [])
         
 
-        match_results = match_skills(required_skills, candidate_skills)
+        match_results = match_skills(required_skills, candidate_skills, similarity_matrix)
         
 
         candidate_with_score = candidate.copy()
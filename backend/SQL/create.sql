@@ -11,6 +11,9 @@ CREATE TABLE Candidates (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     experiance TEXT,  -- can be JSON or TEXT for flexibility
+    profile_version INTEGER NOT NULL DEFAULT 1,  -- bumped when skills, education or experience change
+    activation_token_hash VARCHAR(64),  -- sha256 of the one-time token for bulk-created accounts
+    activation_expires_at TIMESTAMP,
 );
 
 CREATE TYPE skillcategory AS ENUM ('technical', 'soft', 'language', 'other');
@@ -32,11 +35,25 @@ CREATE TABLE Skills (
     skill_id SERIAL PRIMARY KEY,
     candidate_id INTEGER NOT NULL,
     skill_name VARCHAR(255),
+    canonical_skill VARCHAR(255),  -- normalised skill ID used for exact matching
     skill_category skillcategory,
     proficiency_level proficiencylevel,
     FOREIGN KEY (candidate_id) REFERENCES Candidates(candidate_id) ON DELETE CASCADE
 );
 
+-- Inverted index from canonical skill to candidates, used to prefilter shortlisting
+CREATE INDEX ix_skills_canonical_candidate ON Skills (canonical_skill, candidate_id);
+
+
+CREATE TABLE Experience_Embeddings (
+    candidate_id INTEGER PRIMARY KEY,
+    model_tag VARCHAR(100) NOT NULL,  -- embedding model name and version that produced the vector
+    text_hash VARCHAR(64) NOT NULL,   -- sha256 of the preprocessed experience text
+    embedding BYTEA NOT NULL,         -- normalised float32 vector
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (candidate_id) REFERENCES Candidates(candidate_id) ON DELETE CASCADE
+);
+
 
 CREATE TABLE Companies (
     job_id SERIAL PRIMARY KEY,
@@ -53,6 +70,7 @@ CREATE TABLE Companies (
     posted_date DATE DEFAULT CURRENT_DATE,
     application_deadline DATE,
     profile_completed BOOLEAN DEFAULT FALSE,
+    scoring_version INTEGER NOT NULL DEFAULT 1,  -- bumped when skills_required, education_qualification or description change
 );
 
 
@@ -63,9 +81,27 @@ CREATE TABLE AppliedCandidates (
     applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     shortlisted BOOLEAN DEFAULT FALSE,
     compatibility_score DECIMAL(5, 2) DEFAULT 0.00, -- score out of 100
+    skill_score FLOAT,          -- component scores from the last shortlisting run
+    experience_score FLOAT,
+    education_passed BOOLEAN,
+    score_details JSON,         -- skill and experience match details
+    scored_job_version INTEGER,     -- versions the scores were computed against
+    scored_profile_version INTEGER,
 
     FOREIGN KEY (candidate_id) REFERENCES Candidates(candidate_id) ON DELETE CASCADE,
     FOREIGN KEY (job_id) REFERENCES JobListings(job_id) ON DELETE CASCADE,
 
     UNIQUE (candidate_id, job_id) -- prevent duplicate applications to the same job
+);
+
+
+CREATE TABLE Ingested_Resumes (
+    job_id INTEGER NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,  -- sha256 of the resume file bytes
+    candidate_id INTEGER NOT NULL,
+    ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (job_id, content_hash), -- bulk re-uploads skip files already in the manifest
+    FOREIGN KEY (job_id) REFERENCES JobListings(job_id) ON DELETE CASCADE,
+    FOREIGN KEY (candidate_id) REFERENCES Candidates(candidate_id) ON DELETE CASCADE
 );
\ No newline at end of file
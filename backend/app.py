@@ -39,6 +39,17 @@ def create_app():
     register_company_routes(app)
     register_candidate_routes(app)
 
+    # Register CLI commands
+    from ResumeShortlister.modelRegistry import register_model_commands
+    register_model_commands(app)
+    from ResumeShortlister.skillCanonicalizer import register_skill_commands
+    register_skill_commands(app)
+
+    # Load models in the master process so forked workers share them copy-on-write
+    if os.getenv('PRELOAD_MODELS', 'false').lower() == 'true':
+        from ResumeShortlister.modelRegistry import warmup_models
+        warmup_models()
+
     return app
 
 app = create_app()
@@ -1,6 +1,9 @@
 from flask import request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+import hmac
 import json
+from datetime import datetime
+from utils import is_password_usable, hash_activation_token, validate_password_strength
 
 
 def register_auth_routes(app):
@@ -57,6 +60,33 @@ def register_auth_routes(app):
         
         return jsonify({'message': 'Candidate registered successfully'}), 201
 
+    @app.route('/api/activate/candidate', methods=['POST'])
+    def activate_candidate():
+        data = request.get_json()
+        
+        # Validate required fields
+        if not all(key in data for key in ['email', 'token', 'password']):
+            return jsonify({'message': 'Missing required fields'}), 400
+        
+        if not validate_password_strength(data['password']):
+            return jsonify({'message': 'Password must be at least 8 characters and include uppercase, lowercase and a number'}), 400
+        
+        candidate = Candidate.query.filter_by(email=data['email']).first()
+        
+        # Token must match (compared in constant time), be unexpired and can only be used once
+        if not candidate or not candidate.activation_token_hash \
+                or not hmac.compare_digest(candidate.activation_token_hash, hash_activation_token(str(data['token']))) \
+                or (candidate.activation_expires_at and candidate.activation_expires_at < datetime.now()):
+            return jsonify({'message': 'Invalid or expired activation token'}), 400
+        
+        # The bcrypt cost is only paid here, when the candidate actually sets a password
+        candidate.password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+        candidate.activation_token_hash = None
+        candidate.activation_expires_at = None
+        db.session.commit()
+        
+        return jsonify({'message': 'Account activated successfully'}), 200
+
     @app.route('/api/login/company', methods=['POST'])
     def login_company():
         data = request.get_json()
@@ -90,8 +120,9 @@ def register_auth_routes(app):
         # Find candidate by email
         candidate = Candidate.query.filter_by(email=data.get('email', '')).first()
         
-        # Check if candidate exists and password is correct
-        if not candidate or not bcrypt.check_password_hash(candidate.password, data.get('password', '')):
+        # Check if candidate exists and password is correct; bulk-created accounts must be activated first
+        if not candidate or not is_password_usable(candidate.password) \
+                or not bcrypt.check_password_hash(candidate.password, data.get('password', '')):
             return jsonify({'message': 'Invalid email or password'}), 401
         
         # Generate access token with string subject
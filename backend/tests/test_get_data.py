@@ -0,0 +1,56 @@
+from sqlalchemy import event
+from database import db
+from Models.company import Company
+from Models.candidate import Candidate, Education, Skills, AppliedCandidate, SkillCategory, ProficiencyLevel
+from ResumeShortlister.getData import get_applied_candidates
+
+def add_applicants(job_id, start, count):
+    for i in range(start, start + count):
+        candidate = Candidate(fullname=f'Candidate {i}', email=f'candidate{i}@example.com', password='x')
+        candidate.education = [
+            Education(degree='B.Tech', institution='Institute', graduation_year=2020),
+            Education(degree='M.Tech', institution='Institute', graduation_year=2022)
+        ]
+        candidate.skills = [
+            Skills(skill_name=name, canonical_skill=name, skill_category=SkillCategory.technical,
+                   proficiency_level=ProficiencyLevel.intermediate)
+            for name in ('python', 'sql', 'docker')
+        ]
+        db.session.add(candidate)
+        db.session.flush()
+        db.session.add(AppliedCandidate(candidate_id=candidate.candidate_id, job_id=job_id))
+    db.session.commit()
+
+def count_queries(func):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return result, len(statements)
+
+def test_applicant_loading_uses_constant_query_count(app):
+    job = Company(company_email='jobs@example.com', password='x', company_name='Acme')
+    db.session.add(job)
+    db.session.commit()
+    job_id = job.job_id
+
+    add_applicants(job_id, 0, 3)
+    db.session.expunge_all()
+    few, few_queries = count_queries(lambda: get_applied_candidates(job_id))
+
+    add_applicants(job_id, 3, 40)
+    db.session.expunge_all()
+    many, many_queries = count_queries(lambda: get_applied_candidates(job_id))
+
+    assert len(few) == 3
+    assert len(many) == 43
+    assert all(len(c['education']) == 2 and len(c['skills']) == 3 for c in many)
+    # Applications with candidates, then education and skills, whatever the pool size
+    assert few_queries == many_queries == 3
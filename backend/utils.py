@@ -1,4 +1,15 @@
+import os
 import re
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+# Background writer for uploaded files, so requests do not wait on disk I/O
+_file_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix='file-writer')
+
+# Stored instead of a hash for accounts that must be activated first; never matches a bcrypt hash
+UNUSABLE_PASSWORD_PREFIX = '!'
 
 def validate_email(email):
     """Validate email format"""
@@ -26,4 +37,43 @@ def validate_password_strength(password):
 def send_email(recipient, subject, body):
     """Email utility function (placeholder)"""
     # Implement with your preferred email service
-    print(f"Would send email to {recipient}: {subject}")
\ No newline at end of file
+    print(f"Would send email to {recipient}: {subject}")
+
+def make_unusable_password():
+    """Password column value that no login attempt can match"""
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_hex(16)
+
+def is_password_usable(stored_password):
+    return bool(stored_password) and not stored_password.startswith(UNUSABLE_PASSWORD_PREFIX)
+
+def hash_activation_token(token):
+    """Activation tokens are random, so a fast hash is enough to avoid storing them in clear"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def issue_activation_token():
+    """
+    One-time activation token for an account created without a password.
+    Returns (token, token_hash, expires_at); only the hash is stored.
+    Lifetime in hours comes from ACTIVATION_TOKEN_TTL_HOURS.
+    """
+    token = secrets.token_urlsafe(32)
+    expires_at = datetime.now() + timedelta(hours=int(os.getenv('ACTIVATION_TOKEN_TTL_HOURS', 24 * 14)))
+    return token, hash_activation_token(token), expires_at
+
+def _write_file(file_bytes, file_path, replaced_path=None):
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as f:
+            f.write(file_bytes)
+        # Only drop the previous file once the new one is safely on disk
+        if replaced_path and replaced_path != file_path and os.path.exists(replaced_path):
+            os.remove(replaced_path)
+    except Exception as e:
+        print(f"Error saving file {file_path}: {str(e)}")
+
+def save_file_async(file_bytes, file_path, replaced_path=None):
+    """
+    Persist an uploaded file in the background and return immediately.
+    replaced_path, if given, is removed after the new file is written.
+    """
+    return _file_writer.submit(_write_file, file_bytes, file_path, replaced_path)
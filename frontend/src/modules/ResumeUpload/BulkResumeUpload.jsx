@@ -249,6 +249,15 @@ const BulkResumeUpload = () => {
                   style={{ margin: '16px 0' }}
                 />
               )}
+              
+              {uploadResult.skipped_files?.length > 0 && (
+                <Alert
+                  message={`${uploadResult.skipped_files.length} file${uploadResult.skipped_files.length !== 1 ? 's were' : ' was'} already uploaded for this job and skipped`}
+                  type="info"
+                  showIcon
+                  style={{ margin: '16px 0' }}
+                />
+              )}
             </div>
             
             {uploadResult.candidates_created.length > 0 && (
@@ -45,6 +45,29 @@ export const registerCandidate = async (candidateData) => {
   }
 };
 
+// Activate a candidate account created by a company's bulk upload
+export const activateCandidate = async (activationData) => {
+  try {
+    const response = await fetch(`${API_URL}/activate/candidate`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(activationData),
+    });
+    
+    const data = await response.json();
+    
+    if (!response.ok) {
+      throw new Error(data.message || 'Activation failed');
+    }
+    
+    return data;
+  } catch (error) {
+    throw error;
+  }
+};
+
 // New login functions
 export const loginCandidate = async (credentials) => {
   try {
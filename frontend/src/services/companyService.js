@@ -86,6 +86,44 @@ export const getResumeDownloadUrl = (path) => {
   return `${API_URL}${path}`;
 };
 
+/**
+ * Fetch progress of a bulk upload job
+ * @param {string} jobId - Bulk upload job ID
+ * @returns {Promise} Job status with per-file progress
+ */
+export const fetchBulkUploadStatus = async (jobId) => {
+  const response = await authAxios().get(`${API_URL}/company/bulkUpload/${jobId}`);
+  return response.data;
+};
+
+/**
+ * Poll a bulk upload job until it completes or fails
+ * @param {string} jobId - Bulk upload job ID
+ * @param {number} intervalMs - Delay between polls
+ * @param {number} maxDurationMs - Give up polling after this long; the job keeps running on the server
+ * @returns {Promise} Final job status
+ */
+const waitForBulkUploadJob = async (jobId, intervalMs = 2000, maxDurationMs = 30 * 60 * 1000) => {
+  const deadline = Date.now() + maxDurationMs;
+  
+  while (true) {
+    const status = await fetchBulkUploadStatus(jobId);
+    console.log(`Bulk upload progress: ${status.processed_files}/${status.files_found} files`);
+    
+    if (status.status === 'completed') {
+      return status;
+    }
+    if (status.status === 'failed') {
+      throw new Error(status.message || 'Bulk upload failed');
+    }
+    if (Date.now() >= deadline) {
+      throw new Error(`Bulk upload is still processing (${status.processed_files}/${status.files_found} files). Check back later.`);
+    }
+    
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+  }
+};
+
 /**
  * Bulk upload resumes for a job posting
  * @param {File} zipFile - ZIP file containing multiple resumes
@@ -114,7 +152,9 @@ export const bulkUploadResumes = async (zipFile) => {
     });
     
     console.log('Upload response received:', response);
-    return response.data;
+    
+    // Resumes are processed in the background; wait for the job to finish
+    return await waitForBulkUploadJob(response.data.job_id);
   } catch (error) {
     console.error('Error uploading resumes in bulk:', error);
     // Provide more detailed error information